@@ -0,0 +1,166 @@
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROBOT_DIR = os.path.join(HERE, "Robot Nav System")
+sys.path.insert(0, ROBOT_DIR)  # The robot scripts import each other by bare module name
+sys.path.insert(0, HERE)
+
+import Grid as g  # Cell classes of the packed map
+import MapGenerator as mg  # Seeded map generator
+import NavSystem_Manhtn as nav  # GridWorld and a_star
+import Robot as rb  # Nearest-dirt A* robot
+
+CASES = ("robot", "complex", "gridworld")  # Solvers the benchmark knows how to run
+
+
+def load_complex_robot():
+    # The complex-heuristic script has parentheses in its file name, so it is loaded by path
+    spec = importlib.util.spec_from_file_location("Robot2", os.path.join(ROBOT_DIR, "Robot2(ComplexHeuristic).py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Robot
+
+
+class CountingGridWorld(nav.GridWorld):
+    # GridWorld that counts neighbour expansions, which is how a_star explores states
+    def __init__(self, width, height, obstacles):
+        super().__init__(width, height, obstacles)
+        self.num_explored = 0
+
+    def get_neighbors(self, x, y):
+        self.num_explored += 1
+        return super().get_neighbors(x, y)
+
+
+def run_case(case, map_file):
+    # Run one solver on one map in the current process and measure it
+    start_time = time.perf_counter()
+    if case == "robot":
+        robot = rb.Robot(map_file)
+        robot.solve()
+        explored, cost = robot.num_explored, robot.total_cost
+    elif case == "complex":
+        robot = load_complex_robot()(map_file)
+        robot.solve()
+        explored, cost = robot.num_explored, robot.total_cost
+    elif case == "gridworld":
+        # Walls become obstacles; the query runs from the robot start to the last dirt cell.
+        # A set keeps the obstacle test O(1) so large maps finish at all.
+        robot = rb.Robot(map_file)
+        walls = {(int(col), int(row)) for row, col in zip(*(robot.grid.cells == g.WALL).nonzero())}
+        grid = CountingGridWorld(robot.width, robot.height, walls)
+        start = robot.grid.coords(robot.start)[::-1]
+        goal = robot.grid.coords(robot.dirt[-1])[::-1]
+        path = nav.a_star(grid, start, goal)
+        if path is None:
+            raise Exception("no solution")
+        explored, cost = grid.num_explored, len(path) - 1
+    else:
+        raise ValueError("unknown case %r" % case)
+    return {
+        "wall_time": round(time.perf_counter() - start_time, 6),
+        "states_explored": int(explored),
+        "total_cost": float(cost),
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,  # ru_maxrss is in KB on Linux
+    }
+
+
+def run_isolated(case, map_file, timeout):
+    # Run a case in a fresh spawned process so its peak RSS is its own, with a time limit
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=1) as pool:
+        pending = pool.apply_async(run_case, (case, map_file))
+        try:
+            return pending.get(timeout=timeout)
+        except multiprocessing.TimeoutError:
+            pool.terminate()
+            return {"error": "timeout after %ss" % timeout}
+        except Exception as error:
+            return {"error": str(error)}
+
+
+def load_previous_run(history_file, settings=None):
+    # Last run recorded in the JSON lines history file with these settings (any settings if None), or None
+    if not os.path.exists(history_file):
+        return None
+    previous = None
+    with open(history_file) as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                if settings is None or run["settings"] == settings:
+                    previous = run
+    return previous
+
+
+def compare(results, settings, previous, tolerance):
+    # Regressions against the previous run with the same settings:
+    # slower by more than the tolerance, or a search that explored a different number of states
+    if previous is None or previous["settings"] != settings:
+        return []
+    old = {(r["case"], r["size"], r["seed"]): r for r in previous["results"]}
+    regressions = []
+    for result in results:
+        before = old.get((result["case"], result["size"], result["seed"]))
+        if before is None or "error" in before or "error" in result:
+            continue
+        if result["wall_time"] > before["wall_time"] * (1 + tolerance):
+            regressions.append("%s %s: wall time %.3fs -> %.3fs" % (result["case"], result["size"], before["wall_time"], result["wall_time"]))
+        if result["states_explored"] != before["states_explored"]:
+            regressions.append("%s %s: states explored %d -> %d" % (result["case"], result["size"], before["states_explored"], result["states_explored"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the navigation solvers on generated maps.")
+    parser.add_argument("--sizes", default="25,50,100", help="comma separated square map sizes")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma separated solvers: " + ", ".join(CASES))
+    parser.add_argument("--walls", type=float, default=0.2, help="wall density of the generated maps")
+    parser.add_argument("--carpet", type=float, default=0.1, help="carpet density of the generated maps")
+    parser.add_argument("--dirt", type=int, default=10, help="dirt cells per map")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per case")
+    parser.add_argument("--history", default="bench_results.jsonl", help="JSON lines file the runs are appended to")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed wall time growth before flagging a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = args.cases.split(",")
+    for case in cases:
+        if case not in CASES:
+            sys.exit("Unknown case: %s" % case)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            map_file = os.path.join(tmp, "map_%d.txt" % size)
+            mg.write_map(map_file, size, size, args.walls, args.carpet, args.dirt, args.seed)
+            for case in cases:
+                result = {"case": case, "size": size, "seed": args.seed}
+                result.update(run_isolated(case, map_file, args.timeout))
+                results.append(result)
+                if "error" in result:
+                    print("%-10s %6d  %s" % (case, size, result["error"]))
+                else:
+                    print("%-10s %6d  %9.3fs  %9d states  %8.1f MB" % (
+                        case, size, result["wall_time"], result["states_explored"], result["peak_rss"] / 2 ** 20))
+
+    settings = {"walls": args.walls, "carpet": args.carpet, "dirt": args.dirt}
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "settings": settings, "results": results}
+    regressions = compare(results, settings, load_previous_run(args.history, settings), args.tolerance)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(run) + "\n")
+    for regression in regressions:
+        print("REGRESSION", regression)
+
+
+if __name__ == "__main__":
+    main()
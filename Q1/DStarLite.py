@@ -0,0 +1,116 @@
+import heapq
+
+from NavSystem_Manhtn import manhattan_distance
+
+INFINITY = float("inf")
+
+
+class DStarLite:
+    # Incremental planner for a DynamicGridWorld (D* Lite, Koenig & Likhachev).
+    # The search runs backwards from the goal, so when obstacles change or the robot moves
+    # only the part of the search the change touches is repaired, instead of replanning from scratch.
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.last = start             # Start the key modifier was last updated for
+        self.km = 0                   # Key modifier that keeps old queue keys valid as the start moves
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.queue = []               # Heap of (key, cell) entries; outdated entries are skipped
+        self.queued = {goal: self._key(goal)}
+        heapq.heappush(self.queue, (self.queued[goal], goal))
+        self.changed = set()          # Cells whose blocked state changed since the last plan
+        self.num_expanded = 0         # Cells expanded over the lifetime of the planner
+        grid.subscribe(self._on_change)
+
+    def _on_change(self, x, y, blocked):
+        self.changed.add((x, y))
+
+    def _key(self, cell):
+        best = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return (best + manhattan_distance(self.start, cell) + self.km, best)
+
+    def _cells_around(self, cell):
+        # In-bounds 4-neighbours, blocked or not, since edges into a blocked cell still exist at infinite cost
+        x, y = cell
+        return [(nx, ny) for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height]
+
+    def _cost(self, a, b):
+        blocked = self.grid.blocked
+        width = self.grid.width
+        if blocked[a[1] * width + a[0]] or blocked[b[1] * width + b[0]]:
+            return INFINITY
+        return 1
+
+    def _update(self, cell):
+        # Recompute the one-step lookahead of a cell and put it on the queue if it is inconsistent
+        if cell != self.goal:
+            self.rhs[cell] = min((self._cost(cell, other) + self.g.get(other, INFINITY)
+                                  for other in self._cells_around(cell)), default=INFINITY)
+        if self.g.get(cell, INFINITY) != self.rhs.get(cell, INFINITY):
+            key = self._key(cell)
+            self.queued[cell] = key
+            heapq.heappush(self.queue, (key, cell))
+        else:
+            self.queued.pop(cell, None)
+
+    def _top(self):
+        # Lowest live queue entry, dropping outdated ones
+        while self.queue:
+            key, cell = self.queue[0]
+            if self.queued.get(cell) == key:
+                return key, cell
+            heapq.heappop(self.queue)
+        return (INFINITY, INFINITY), None
+
+    def _compute_shortest_path(self):
+        while True:
+            key, cell = self._top()
+            start_rhs = self.rhs.get(self.start, INFINITY)
+            if cell is None or (key >= self._key(self.start) and start_rhs == self.g.get(self.start, INFINITY)):
+                return
+            self.num_expanded += 1
+            new_key = self._key(cell)
+            if key < new_key:
+                self.queued[cell] = new_key
+                heapq.heappush(self.queue, (new_key, cell))
+            elif self.g.get(cell, INFINITY) > self.rhs.get(cell, INFINITY):
+                self.g[cell] = self.rhs[cell]
+                del self.queued[cell]
+                for other in self._cells_around(cell):
+                    self._update(other)
+            else:
+                self.g[cell] = INFINITY
+                del self.queued[cell]
+                self._update(cell)
+                for other in self._cells_around(cell):
+                    self._update(other)
+
+    def move_to(self, start):
+        # Tell the planner the robot has moved; the search tree is kept
+        self.start = start
+
+    def plan(self):
+        # Repair the search for obstacle changes and robot moves since the last call.
+        # Returns the path from the start to the goal like a_star(), or None if the goal is unreachable.
+        if self.start != self.last:
+            self.km += manhattan_distance(self.last, self.start)
+            self.last = self.start
+        for cell in self.changed:
+            self._update(cell)
+            for other in self._cells_around(cell):
+                self._update(other)
+        self.changed.clear()
+        self._compute_shortest_path()
+
+        if self.g.get(self.start, INFINITY) == INFINITY:
+            return None
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            current = min(self._cells_around(current),
+                          key=lambda other: self._cost(current, other) + self.g.get(other, INFINITY))
+            path.append(current)
+        return path
@@ -0,0 +1,164 @@
+import heapq
+
+# Search engines for uniform-cost, 4-connected GridWorld queries. They read the grid's
+# bitmap obstacle index (grid.blocked, one byte per cell at y * width + x) directly and
+# return the path from start to goal as a list of (x, y) cells, or None if there is none.
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _walkable(grid):
+    # Fast walkability test bound to the grid's bitmap
+    width = grid.width
+    height = grid.height
+    blocked = grid.blocked
+
+    def walkable(x, y):
+        return 0 <= x < width and 0 <= y < height and not blocked[y * width + x]
+    return walkable
+
+
+def _straight_line(a, b):
+    # Cells after a up to and including b, which lie on the same row or column
+    dx = (b[0] > a[0]) - (b[0] < a[0])
+    dy = (b[1] > a[1]) - (b[1] < a[1])
+    cells = []
+    x, y = a
+    while (x, y) != b:
+        x += dx
+        y += dy
+        cells.append((x, y))
+    return cells
+
+
+def jump_point_search(grid, start, goal):
+    # Jump Point Search for 4-connected grids. Canonical paths run vertically and turn
+    # horizontally, so horizontal runs are only broken where an obstacle forces a turn, and
+    # A* only expands the jump points at the ends of those runs instead of every open cell.
+    walkable = _walkable(grid)
+    if not walkable(*start) or not walkable(*goal):
+        return None
+
+    def jump_horizontal(x, y, dx):
+        while True:
+            x += dx
+            if not walkable(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or \
+                    (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+                return (x, y)
+
+    def jump_vertical(x, y, dy):
+        while True:
+            y += dy
+            if not walkable(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                    (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+                return (x, y)
+            # Moving vertically, any horizontal run that reaches a jump point makes this cell one
+            if jump_horizontal(x, y, 1) or jump_horizontal(x, y, -1):
+                return (x, y)
+
+    def directions(cell, parent):
+        # Pruned set of directions to jump in from a jump point
+        x, y = cell
+        if parent is None:
+            return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        if dx:
+            return [(0, -1), (0, 1), (dx, 0)]
+        return [(-1, 0), (1, 0), (0, dy)]
+
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+    frontier = [(_manhattan(start, goal), 0, start)]
+    while frontier:
+        _, cost, current = heapq.heappop(frontier)
+        if cost > cost_so_far[current]:
+            continue
+        if current == goal:
+            path = [goal]
+            while came_from[current] is not None:
+                previous = came_from[current]
+                path[:0] = [previous] + _straight_line(previous, current)[:-1]
+                current = previous
+            return path
+        x, y = current
+        for dx, dy in directions(current, came_from[current]):
+            if not walkable(x + dx, y + dy):
+                continue
+            point = jump_horizontal(x, y, dx) if dx else jump_vertical(x, y, dy)
+            if point is None:
+                continue
+            new_cost = cost + _manhattan(current, point)
+            if point not in cost_so_far or new_cost < cost_so_far[point]:
+                cost_so_far[point] = new_cost
+                came_from[point] = current
+                heapq.heappush(frontier, (new_cost + _manhattan(point, goal), new_cost, point))
+    return None
+
+
+def bidirectional_a_star(grid, start, goal):
+    # Bidirectional A* with the average potential p(v) = (h(v, goal) - h(v, start)) / 2.
+    # Both searches see the same consistent reduced costs, so they can stop as soon as the
+    # smallest keys of the two queues add up to the best meeting cost found so far.
+    walkable = _walkable(grid)
+    if not walkable(*start) or not walkable(*goal):
+        return None
+    if start == goal:
+        return [start]
+
+    def potential(cell):
+        return (_manhattan(cell, goal) - _manhattan(cell, start)) / 2
+
+    costs = ({start: 0}, {goal: 0})         # Forward and backward path costs
+    parents = ({start: None}, {goal: None})
+    frontiers = ([(potential(start), start)], [(-potential(goal), goal)])
+    closed = (set(), set())
+    best = float("inf")
+    meeting = None
+
+    while frontiers[0] and frontiers[1]:
+        if frontiers[0][0][0] + frontiers[1][0][0] >= best:
+            break
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        sign = 1 if side == 0 else -1
+        _, current = heapq.heappop(frontiers[side])
+        if current in closed[side]:
+            continue
+        closed[side].add(current)
+        cost, other_cost = costs[side], costs[1 - side]
+        x, y = current
+        for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if not walkable(*neighbor):
+                continue
+            new_cost = cost[current] + 1
+            if neighbor not in cost or new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                parents[side][neighbor] = current
+                heapq.heappush(frontiers[side], (new_cost + sign * potential(neighbor), neighbor))
+            if neighbor in other_cost and cost[neighbor] + other_cost[neighbor] < best:
+                best = cost[neighbor] + other_cost[neighbor]
+                meeting = neighbor
+
+    if meeting is None:
+        return None
+    path = []
+    cell = meeting
+    while cell is not None:
+        path.append(cell)
+        cell = parents[0][cell]
+    path.reverse()
+    cell = parents[1][meeting]
+    while cell is not None:
+        path.append(cell)
+        cell = parents[1][cell]
+    return path
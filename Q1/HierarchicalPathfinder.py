@@ -0,0 +1,286 @@
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+from NavSystem_Manhtn import manhattan_distance
+
+# Walkable runs along a cluster border at least this long get an entrance at each end, shorter ones one in the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalPathfinder:
+    # Hierarchical path-finding (HPA*, Botea, Mueller & Schaeffer) for repeated GridWorld queries.
+    # The map is cut into cluster_size x cluster_size clusters; every walkable run along a border
+    # between two clusters gets entrance cells, and the distances between the entrances of a
+    # cluster are precomputed. A query only searches this small abstract graph and then stitches
+    # the path together inside the clusters it crosses. Paths are near-optimal, or exact with refine=True.
+    # Answers are kept in an LRU cache keyed by (start, goal, map version). On a grid with
+    # subscribe() (DynamicGridWorld) obstacle changes rebuild only the clusters around them and
+    # clear the cache; a plain GridWorld is treated as static.
+    def __init__(self, grid, cluster_size=10, cache_size=4096):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()    # (start, goal, version, refine) -> path, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.clusters_x = -(-grid.width // cluster_size)
+        self.clusters_y = -(-grid.height // cluster_size)
+        self.borders = {}             # (cluster, cluster) -> list of (cell, cell) entrance pairs across the border
+        self.inter = {}               # Entrance cell -> set of entrance cells across a border
+        self.intra = {}               # Cluster -> {entrance cell: {entrance cell: distance inside the cluster}}
+        self.dirty = set()            # Clusters with obstacle changes that have not been rebuilt yet
+        self._build(self._all_clusters())
+        if hasattr(grid, "subscribe"):
+            grid.subscribe(self._on_change)
+
+    def _all_clusters(self):
+        return {(cx, cy) for cx in range(self.clusters_x) for cy in range(self.clusters_y)}
+
+    def _cluster(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _walkable(self, x, y):
+        grid = self.grid
+        return 0 <= x < grid.width and 0 <= y < grid.height and not grid.blocked[y * grid.width + x]
+
+    def _on_change(self, x, y, blocked):
+        self.dirty.add(self._cluster((x, y)))
+        self.cache.clear()
+
+    def _borders_of(self, cluster):
+        # The up to four borders of a cluster, each keyed by its (lower, upper) cluster pair
+        cx, cy = cluster
+        borders = []
+        if cx > 0:
+            borders.append(((cx - 1, cy), cluster))
+        if cx + 1 < self.clusters_x:
+            borders.append((cluster, (cx + 1, cy)))
+        if cy > 0:
+            borders.append(((cx, cy - 1), cluster))
+        if cy + 1 < self.clusters_y:
+            borders.append((cluster, (cx, cy + 1)))
+        return borders
+
+    def _find_entrances(self, border):
+        # Entrance cell pairs along the border between two neighbouring clusters
+        (ax, ay), (bx, by) = border
+        size = self.cluster_size
+        if bx > ax:
+            # Vertical border: the last column of a against the first column of b
+            x = bx * size
+            pairs = [((x - 1, y), (x, y)) for y in range(ay * size, min((ay + 1) * size, self.grid.height))]
+        else:
+            y = by * size
+            pairs = [((x, y - 1), (x, y)) for x in range(ax * size, min((ax + 1) * size, self.grid.width))]
+        entrances = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and self._walkable(*a) and self._walkable(*b):
+                run.append((a, b))
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        return entrances
+
+    def _search_cluster(self, source, cluster, targets=None):
+        # Breadth-first search from source that stays inside cluster, over flat y * width + x cell IDs.
+        # Returns the distance to every cell reached, stopping early once all targets are reached.
+        size = self.cluster_size
+        width, blocked = self.grid.width, self.grid.blocked
+        left, top = cluster[0] * size, cluster[1] * size
+        right, bottom = min(left + size, width), min(top + size, self.grid.height)
+        first, last = top * width, bottom * width
+        origin = source[1] * width + source[0]
+        distances = {origin: 0}
+        wanted = {y * width + x for x, y in targets} - {origin} if targets is not None else None
+        remaining = len(wanted) if wanted is not None else -1
+        frontier = [origin]
+        steps = 0
+        while frontier and remaining:
+            steps += 1
+            reached = []
+            for cell in frontier:
+                x = cell % width
+                for neighbor in ((cell + 1) if x + 1 < right else -1, (cell - 1) if x > left else -1,
+                                 cell + width, cell - width):
+                    if first <= neighbor < last and neighbor not in distances and not blocked[neighbor]:
+                        distances[neighbor] = steps
+                        reached.append(neighbor)
+                        if wanted is not None and neighbor in wanted:
+                            remaining -= 1
+            frontier = reached
+        return {(cell % width, cell // width): steps for cell, steps in distances.items()}
+
+    def _distances(self, source, cluster, targets):
+        # Distance inside cluster from source to each target it can reach
+        distances = self._search_cluster(source, cluster, targets)
+        return {target: distances[target] for target in targets if target in distances}
+
+    def _cluster_distances(self, cluster, nodes):
+        # Distances inside a cluster between all pairs of its entrance cells, from one breadth-first
+        # search per entrance run side by side on a (entrance, row, column) array of reached cells
+        size = self.cluster_size
+        left, top = cluster[0] * size, cluster[1] * size
+        free = np.frombuffer(self.grid.blocked, dtype=np.uint8).reshape(self.grid.height, self.grid.width)
+        free = free[top:top + size, left:left + size] == 0
+        rows = np.array([y - top for x, y in nodes], dtype=np.intp)
+        cols = np.array([x - left for x, y in nodes], dtype=np.intp)
+        found = np.full((len(nodes), len(nodes)), -1, dtype=np.int64)
+        found[np.arange(len(nodes)), np.arange(len(nodes))] = 0
+        reached = np.zeros((len(nodes),) + free.shape, dtype=np.bool_)
+        reached[np.arange(len(nodes)), rows, cols] = True
+        frontier = reached.copy()
+        steps = 0
+        while frontier.any():
+            steps += 1
+            grown = np.zeros_like(frontier)
+            grown[:, 1:, :] |= frontier[:, :-1, :]
+            grown[:, :-1, :] |= frontier[:, 1:, :]
+            grown[:, :, 1:] |= frontier[:, :, :-1]
+            grown[:, :, :-1] |= frontier[:, :, 1:]
+            frontier = grown & free & ~reached
+            reached |= frontier
+            found[frontier[:, rows, cols]] = steps
+        return {node: {other: int(found[i, j]) for j, other in enumerate(nodes) if found[i, j] >= 0}
+                for i, node in enumerate(nodes)}
+
+    def _build(self, clusters):
+        # (Re)build the entrances on every border of the given clusters and the intra-cluster
+        # distances of every cluster those borders touch
+        borders = {border for cluster in clusters for border in self._borders_of(cluster)}
+        touched = set(clusters)
+        for border in borders:
+            for a, b in self.borders.get(border, ()):
+                self.inter[a].discard(b)
+                self.inter[b].discard(a)
+            self.borders[border] = self._find_entrances(border)
+            for a, b in self.borders[border]:
+                self.inter.setdefault(a, set()).add(b)
+                self.inter.setdefault(b, set()).add(a)
+            touched.update(border)
+        for cluster in touched:
+            nodes = {cell for border in self._borders_of(cluster)
+                     for pair in self.borders.get(border, ()) for cell in pair
+                     if self._cluster(cell) == cluster}
+            self.intra[cluster] = self._cluster_distances(cluster, sorted(nodes))
+
+    def _rebuild(self):
+        if self.dirty:
+            self._build(self.dirty)
+            self.dirty.clear()
+
+    def _abstract_path(self, start, goal):
+        # A* over the entrance graph, with start and goal linked to the entrances of their clusters
+        start_cluster, goal_cluster = self._cluster(start), self._cluster(goal)
+        start_edges = self._distances(start, start_cluster, set(self.intra[start_cluster]) | {goal})
+        if goal not in start_edges or start_cluster != goal_cluster:
+            start_edges.pop(goal, None)
+        goal_edges = self._distances(goal, goal_cluster, set(self.intra[goal_cluster]))
+
+        def edges(node):
+            if node == start:
+                yield from start_edges.items()
+            else:
+                yield from self.intra[self._cluster(node)].get(node, {}).items()
+            for other in self.inter.get(node, ()):
+                yield other, 1
+            if node in goal_edges:
+                yield goal, goal_edges[node]
+
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+        frontier = [(manhattan_distance(start, goal), 0, start)]
+        while frontier:
+            _, cost, current = heapq.heappop(frontier)
+            if cost > cost_so_far[current]:
+                continue
+            if current == goal:
+                nodes = []
+                while current is not None:
+                    nodes.append(current)
+                    current = came_from[current]
+                return nodes[::-1]
+            for neighbor, step in edges(current):
+                new_cost = cost + step
+                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    cost_so_far[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(frontier, (new_cost + manhattan_distance(neighbor, goal), new_cost, neighbor))
+        return None
+
+    def _segment(self, a, b):
+        # Cells after a up to and including b, for two nodes that are linked in the abstract graph
+        if self._cluster(a) != self._cluster(b):
+            return [b]
+        # Search back from b, then walk down the distances from a
+        distances = self._search_cluster(b, self._cluster(b), {a})
+        cells = []
+        x, y = a
+        while (x, y) != b:
+            steps = distances[(x, y)] - 1
+            x, y = next(cell for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)) if distances.get(cell) == steps)
+            cells.append((x, y))
+        return cells
+
+    def _exact_path(self, start, goal, bound):
+        # A* on the grid itself, skipping every cell that cannot lie on a path of at most bound steps
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+        frontier = [(manhattan_distance(start, goal), 0, start)]  # Ties go to the deepest entry
+        while frontier:
+            _, cost, current = heapq.heappop(frontier)
+            cost = -cost
+            if cost > cost_so_far[current]:
+                continue
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            x, y = current
+            for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                new_cost = cost + 1
+                estimate = new_cost + manhattan_distance(neighbor, goal)
+                if estimate <= bound and self._walkable(*neighbor) and \
+                        (neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]):
+                    cost_so_far[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(frontier, (estimate, -new_cost, neighbor))
+        return None
+
+    def find_path(self, start, goal, refine=False):
+        # Path from start to goal as a list of cells like a_star(), or None if the goal is unreachable.
+        # With refine=True the path is a shortest path, found by a grid search bounded by the hierarchical one.
+        key = (start, goal, getattr(self.grid, "version", 0), refine)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            path = self.cache[key]
+            return list(path) if path is not None else None
+        self.misses += 1
+        self._rebuild()
+
+        if not self._walkable(*start) or not self._walkable(*goal):
+            path = None
+        elif start == goal:
+            path = [start]
+        else:
+            nodes = self._abstract_path(start, goal)
+            if nodes is None:
+                path = None
+            else:
+                path = [start]
+                for a, b in zip(nodes, nodes[1:]):
+                    path += self._segment(a, b)
+                if refine:
+                    path = self._exact_path(start, goal, len(path) - 1)
+
+        self.cache[key] = path
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return list(path) if path is not None else None
@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROBOT_DIR = os.path.join(HERE, "Robot Nav System")
+sys.path.insert(0, ROBOT_DIR)  # The robot scripts import each other by bare module name
+sys.path.insert(0, HERE)
+
+import Grid as g  # Cell classes of the packed map
+import MapLoader as ml  # Bulk map file loader
+import NavSystem_Manhtn as nav  # GridWorld and a_star
+import Robot as rb  # Nearest-dirt A* robot and coverage planner
+
+# Local navigation query service. Maps are loaded once, by the service and by every worker process,
+# and queried over a local socket with one JSON object per line in each direction:
+#   {"id": 1, "op": "path", "map": "h1", "start": [x, y], "goal": [x, y]}   shortest path on the map
+#   {"id": 2, "op": "plan", "map": "h1", "mode": "astar" | "coverage"}       cleaning plan of the map
+#   {"id": 3, "op": "stats"}                                                  latency and throughput
+# A plan result holds total_cost, states_explored, and the actions and cells of the path, cells as [x, y].
+# Path queries treat walls as obstacles and every other cell as a unit step, like GridWorld; x is the
+# column and y the row. Answers are {"id": ..., "ok": true, "result": ...} or {"id": ..., "ok": false,
+# "error": ...}, written as soon as they are ready, so they may come back in a different order.
+#
+# Requests that arrive within batch_window seconds of each other and share a search are answered by one
+# job on the worker pool: path queries from the same start on the same map by one breadth-first search
+# to all their goals, identical plan requests by one solve.
+
+PLAN_MODES = ("astar", "coverage")
+BATCH_WINDOW = 0.002     # Seconds a batch stays open for more requests after its first one
+LATENCY_WINDOW = 10000   # Most recent request latencies kept for the percentiles
+
+_worlds = {}   # Map name -> GridWorld, in a worker process
+_robots = {}   # Map name -> Robot, in a worker process, built on the map's first plan request
+_plans = {}    # (map name, mode) -> plan result, in a worker process; maps never change, so plans are solved once
+_files = {}    # Map name -> map file, in a worker process
+
+
+def load_world(filename):
+    # GridWorld of a map file: walls are the obstacles
+    grid = ml.load_grid(filename)
+    rows, cols = np.nonzero(grid.cells == g.WALL)
+    return nav.GridWorld(grid.width, grid.height, list(zip(cols.tolist(), rows.tolist())))
+
+
+def _init_worker(maps):
+    # Load every map once per worker instead of with every job
+    _files.update(maps)
+    for name, filename in maps.items():
+        _worlds[name] = load_world(filename)
+
+
+def find_paths(job):
+    # Shortest paths from one start to several goals. A single goal uses Jump Point Search; more goals
+    # share one breadth-first search that stops once all of them are reached. Unreachable goals get None.
+    name, start, goals = job
+    world = _worlds[name]
+    if len(goals) == 1:
+        return [nav.a_star(world, start, goals[0], engine="jps")]
+
+    width, blocked = world.width, world.blocked
+    source = start[1] * width + start[0]
+    parent = {source: -1}
+    targets = {y * width + x for x, y in goals}
+    targets.discard(source)
+    queue = deque([source])
+    while queue and targets:
+        cell = queue.popleft()
+        y, x = divmod(cell, width)
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            neighbor = ny * width + nx
+            if 0 <= nx < width and 0 <= ny < world.height and not blocked[neighbor] and neighbor not in parent:
+                parent[neighbor] = cell
+                targets.discard(neighbor)
+                queue.append(neighbor)
+
+    paths = []
+    for x, y in goals:
+        cell = y * width + x
+        if cell not in parent:
+            paths.append(None)
+            continue
+        path = []
+        while cell != -1:
+            path.append((cell % width, cell // width))
+            cell = parent[cell]
+        path.reverse()
+        paths.append(path)
+    return paths
+
+
+def make_plan(job):
+    # Cleaning plan of a map with the A* sweep or the full-coverage planner, solved once per worker
+    name, mode = job
+    plan = _plans.get(job)
+    if plan is not None:
+        return plan
+    robot = _robots.get(name)
+    if robot is None:
+        robot = _robots[name] = rb.Robot(_files[name])
+    if mode == "coverage":
+        robot.solve_coverage()
+    else:
+        robot.solve()
+    actions, cells = robot.solution
+    plan = _plans[job] = {
+        "total_cost": int(robot.total_cost),
+        "states_explored": robot.num_explored,
+        "actions": actions,
+        "cells": [list(robot.grid.coords(cell)[::-1]) for cell in cells],  # (row, col) -> [x, y]
+    }
+    return plan
+
+
+class NavService():
+    def __init__(self, maps, workers=None, batch_window=BATCH_WINDOW):
+        # maps: map name -> map file
+        self.maps = dict(maps)
+        self.worlds = {name: load_world(filename) for name, filename in self.maps.items()}
+        self.executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.maps,))
+        self.batch_window = batch_window
+        self.pending = {}             # Batch key -> [(item, future)] of the batch still collecting requests
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {"requests": 0, "errors": 0, "batches": 0, "batched_requests": 0}
+        self.started = time.perf_counter()
+
+    async def handle(self, reader, writer):
+        # Serve one connection; every request line is answered by its own task
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer):
+        received = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = {"id": request_id, "ok": True, "result": await self.answer(request)}
+        except Exception as error:
+            self.counters["errors"] += 1
+            response = {"id": request_id, "ok": False, "error": str(error) or type(error).__name__}
+        self.counters["requests"] += 1
+        self.latencies.append(time.perf_counter() - received)
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def answer(self, request):
+        op = request.get("op")
+        if op == "stats":
+            return self.stats()
+        if op not in ("path", "plan"):
+            raise ValueError("unknown op: %s" % op)
+        name = request.get("map")
+        if name not in self.maps:
+            raise ValueError("unknown map: %s" % name)
+        if op == "path":
+            start = self._cell(name, request.get("start"))
+            goal = self._cell(name, request.get("goal"))
+            return await self._batched(("path", name, start), goal, find_paths)
+        mode = request.get("mode", "astar")
+        if mode not in PLAN_MODES:
+            raise ValueError("unknown mode: %s" % mode)
+        return await self._batched(("plan", name, mode), None, make_plan)
+
+    def _cell(self, name, position):
+        # Validate an [x, y] position on a map before it reaches a worker
+        world = self.worlds[name]
+        if not isinstance(position, (list, tuple)) or len(position) != 2:
+            raise ValueError("positions are [x, y] pairs")
+        x, y = int(position[0]), int(position[1])
+        if not world.is_valid_move(x, y):
+            raise ValueError("(%d, %d) is outside the map or a wall" % (x, y))
+        return (x, y)
+
+    async def _batched(self, key, item, function):
+        # Join the batch of requests sharing key, opening one if none is collecting, and wait for its answer
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = []
+            loop.call_later(self.batch_window, self._flush, key, function)
+        batch.append((item, future))
+        return await future
+
+    def _flush(self, key, function):
+        batch = self.pending.pop(key)
+        self.counters["batches"] += 1
+        self.counters["batched_requests"] += len(batch)
+        asyncio.ensure_future(self._run_batch(key, batch, function))
+
+    async def _run_batch(self, key, batch, function):
+        # Run the shared search of a batch on the worker pool and hand every request its part
+        loop = asyncio.get_running_loop()
+        if key[0] == "path":
+            goals = list(dict.fromkeys(item for item, future in batch))
+            job = (key[1], key[2], goals)
+        else:
+            job = key[1:]
+        try:
+            result = await loop.run_in_executor(self.executor, function, job)
+        except Exception as error:
+            for item, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        if key[0] == "path":
+            paths = dict(zip(goals, result))
+            for goal, future in batch:
+                if not future.done():
+                    path = paths[goal]
+                    future.set_result(None if path is None else {"path": [list(cell) for cell in path],
+                                                                 "cost": len(path) - 1})
+        else:
+            for item, future in batch:
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        # Counters since the start, with latency percentiles over the most recent requests
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1e3
+        stats = dict(self.counters)
+        stats["uptime"] = round(uptime, 3)
+        stats["throughput"] = round(self.counters["requests"] / uptime, 3) if uptime else 0.0
+        stats["mean_batch"] = round(self.counters["batched_requests"] / self.counters["batches"], 3) if self.counters["batches"] else 0.0
+        stats["p50_ms"] = round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None
+        stats["p99_ms"] = round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None
+        return stats
+
+    async def serve(self, socket_path=None, port=None):
+        # Accept connections on a Unix socket, or on 127.0.0.1:port, until SIGINT or SIGTERM
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, "127.0.0.1", port)
+        loop = asyncio.get_running_loop()
+        try:
+            async with server:
+                serving = asyncio.ensure_future(server.serve_forever())
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    loop.add_signal_handler(signum, serving.cancel)
+                try:
+                    await serving
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            self.executor.shutdown()
+            if socket_path is not None and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def query(requests, socket_path=None, port=None):
+    # Send requests to a running service and return its responses in the order they come back
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection(("127.0.0.1", port))
+    with connection, connection.makefile("rw") as stream:
+        for request in requests:
+            stream.write(json.dumps(request) + "\n")
+        stream.flush()
+        return [json.loads(stream.readline()) for _ in requests]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve path and cleaning-plan queries on preloaded maps over a local socket.")
+    parser.add_argument("maps", nargs="+", help="map files, as NAME=FILE or FILE (named after the file)")
+    parser.add_argument("--socket", help="Unix socket path to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port on 127.0.0.1, when no socket is given")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW, help="seconds a batch waits for more requests")
+    args = parser.parse_args(argv)
+
+    maps = {}
+    for spec in args.maps:
+        name, _, filename = spec.rpartition("=")
+        maps[name or os.path.splitext(os.path.basename(filename))[0]] = filename
+    service = NavService(maps, args.jobs, args.batch_window)
+    print("Serving %s on %s" % (", ".join(sorted(maps)), args.socket or "127.0.0.1:%d" % args.port))
+    asyncio.run(service.serve(args.socket, args.port))
+    print(json.dumps(service.stats()))
+
+
+if __name__ == "__main__":
+    main()
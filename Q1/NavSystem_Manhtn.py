@@ -1,60 +1,147 @@
+import contextlib
 import heapq
 
+import GridEngines
+
 class GridWorld:
     def __init__(self, width, height, obstacles):
         self.width = width
         self.height = height
-        self.obstacles = obstacles
+        # Bitmap obstacle index, one byte per cell at y * width + x, so membership tests are O(1).
+        # obstacles is frozen to match it; a DynamicGridWorld is for maps whose obstacles change.
+        self.obstacles = frozenset(obstacles)
+        self.blocked = bytearray(width * height)
+        for x, y in self.obstacles:
+            if 0 <= x < width and 0 <= y < height:
+                self.blocked[y * width + x] = 1
  
     def is_valid_move(self, x, y):
-        return 0 <= x < self.width and 0 <= y < self.height and (x, y) not in self.obstacles
+        return 0 <= x < self.width and 0 <= y < self.height and not self.blocked[y * self.width + x]
 
     def get_neighbors(self, x, y):
         neighbors = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)] 
         valid_neighbors = [(nx, ny) for nx, ny in neighbors if self.is_valid_move(nx, ny)]
         return valid_neighbors
 
+class DynamicGridWorld(GridWorld):
+    # GridWorld whose obstacles can be added and removed after construction.
+    # Every change bumps the version and is reported to the subscribed listeners as (x, y, blocked).
+    # Obstacles outside the grid are recorded but change nothing, so they are not reported.
+    # Obstacles must only be changed through add_obstacle() and remove_obstacle(), which keep the bitmap in step.
+    def __init__(self, width, height, obstacles):
+        super().__init__(width, height, obstacles)
+        self.obstacles = set(self.obstacles)
+        self.version = 0
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def add_obstacle(self, x, y):
+        if (x, y) in self.obstacles:
+            return False
+        self.obstacles.add((x, y))
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.blocked[y * self.width + x] = 1
+            self._changed(x, y, True)
+        return True
+
+    def remove_obstacle(self, x, y):
+        if (x, y) not in self.obstacles:
+            return False
+        self.obstacles.remove((x, y))
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.blocked[y * self.width + x] = 0
+            self._changed(x, y, False)
+        return True
+
+    def _changed(self, x, y, blocked):
+        self.version += 1
+        for listener in self.listeners:
+            listener(x, y, blocked)
+
 def manhattan_distance(p1, p2):
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
-def a_star(grid, start, environment):
+def a_star(grid, start, goal, engine="astar", stats=None):
+    # engine picks the search for this uniform-cost grid: "astar" (below), "jps" for
+    # Jump Point Search or "bidirectional" for bidirectional A*; all return optimal paths,
+    # and all return None when the goal cannot be reached.
+    # stats is any object with the hooks of SearchStats (Robot Nav System/SearchStats.py); it is
+    # filled in by the "astar" engine only. Without it the loop runs with the bare functions.
+    if engine == "jps":
+        return GridEngines.jump_point_search(grid, start, goal)
+    if engine == "bidirectional":
+        return GridEngines.bidirectional_a_star(grid, start, goal)
+    if engine != "astar":
+        raise ValueError("unknown engine: %s" % engine)
+
     frontier = [(0, start)]
     came_from = {}
     cost_so_far = {start: 0}
 
-    while frontier:
-        current_cost, current_node = heapq.heappop(frontier)
+    push, pop = heapq.heappush, heapq.heappop
+    heuristic, get_neighbors = manhattan_distance, grid.get_neighbors
+    phase = lambda name: contextlib.nullcontext()
+    if stats is not None:
+        push = stats.pushing(push, frontier)
+        pop = stats.popping(pop)
+        heuristic = stats.counted("heuristic_calls", heuristic, "heuristic")
+        get_neighbors = stats.counted("neighbor_calls", get_neighbors, "neighbors")
+        phase = stats.phase
+    on_expand = stats.on_expand if stats is not None else None
+    expansions = stale_pops = 0
+
+    with phase("search"):
+        while frontier:
+            current_cost, current_node = pop(frontier)
+
+            if stats is not None:
+                # A popped entry is stale when the node was queued again more cheaply since
+                expansions += 1
+                if current_cost != cost_so_far[current_node] + manhattan_distance(goal, current_node):
+                    stale_pops += 1
+                if on_expand is not None:
+                    on_expand(current_node, cost_so_far[current_node])
+
+            if current_node == goal:
+                break
 
-        if current_node == goal:
-            break
+            for next_node in get_neighbors(*current_node):
+                new_cost = cost_so_far[current_node] + 1  # Cost of moving to next node is 1
 
-        for next_node in grid.get_neighbors(*current_node):
-            new_cost = cost_so_far[current_node] + 1  # Cost of moving to next node is 1
+                if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
+                    cost_so_far[next_node] = new_cost
+                    priority = new_cost + heuristic(goal, next_node)
+                    push(frontier, (priority, next_node))
+                    came_from[next_node] = current_node
+    if stats is not None:
+        stats.add("expansions", expansions)
+        stats.add("stale_pops", stale_pops)
 
-            if next_node not in cost_so_far or new_cost < cost_so_far[next_node]:
-                cost_so_far[next_node] = new_cost
-                priority = new_cost + manhattan_distance(goal, next_node)
-                heapq.heappush(frontier, (priority, next_node))
-                came_from[next_node] = current_node
+    if goal not in cost_so_far:
+        return None
 
-    path = []
-    current = goal
-    while current != start:
-        path.append(current)
-        current = came_from[current]
-    path.append(start)
-    path.reverse()
+    with phase("reconstruct"):
+        path = []
+        current = goal
+        while current != start:
+            path.append(current)
+            current = came_from[current]
+        path.append(start)
+        path.reverse()
     return path
 
-# Example usage:
-width = 10
-height = 10
-obstacles = [(2, 2), (3, 3), (4, 4)]  # Define obstacle coordinates
-start = (0, 0)
-goal = (9, 9)
+if __name__ == "__main__":
+    # Example usage:
+    width = 10
+    height = 10
+    obstacles = [(2, 2), (3, 3), (4, 4)]  # Define obstacle coordinates
+    start = (0, 0)
+    goal = (9, 9)
 
-grid = GridWorld(width, height, obstacles)
-path = a_star(grid, start, goal)
-print("Optimal Path:", path)
+    grid = GridWorld(width, height, obstacles)
+    path = a_star(grid, start, goal)
+    print("Optimal Path:", path)
 
 ############Takes the shortest path############ we need to confirm this
\ No newline at end of file
@@ -0,0 +1,116 @@
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from multiprocessing import Pool
+
+import Robot as rb  # Importing the Robot class that parses and solves a single map
+
+
+def find_maps(patterns):
+    # Expand directories and glob patterns into a sorted, duplicate-free list of map files
+    maps = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*.txt")))
+        else:
+            matches = sorted(glob.glob(pattern))
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                maps.append(path)
+    return maps
+
+
+def image_names(maps):
+    # Image file name of every map: its base name as .png, with -2, -3, ... added when maps in
+    # different directories share a base name, so no image overwrites another
+    names = []
+    used = set()
+    for path in maps:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, copy = stem + ".png", 1
+        while name in used:
+            copy += 1
+            name = "%s-%d.png" % (stem, copy)
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def solve_map(job):
+    # Solve one map inside a worker and return its result record
+    path, image, coverage, trace_memory, cache_dir, peak_rss = job
+    result = {"map": path}
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        robot = rb.Robot(path, cache_dir)
+        if coverage:
+            robot.solve_coverage()
+        else:
+            robot.solve()
+        result["states_explored"] = robot.num_explored
+        result["total_cost"] = int(robot.total_cost)
+        if image is not None:
+            robot.output_image(image, show_explored=True)
+    except Exception as error:
+        result["error"] = str(error)
+    result["wall_time"] = round(time.perf_counter() - start_time, 6)
+
+    # ru_maxrss is in kilobytes on Linux and is the high-water mark of the whole worker process, so it
+    # is only recorded when every map gets a worker of its own; tracemalloc gives the peak of this
+    # solve alone, at the price of slowing it down
+    if peak_rss:
+        result["peak_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    if trace_memory:
+        result["peak_traced"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many maps in parallel and stream the results as JSON lines.")
+    parser.add_argument("maps", nargs="+", help="map files, directories of .txt maps, or glob patterns")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-o", "--output", help="write the JSON lines to this file instead of stdout")
+    parser.add_argument("--images", metavar="DIR", help="also render every solved map as DIR/<map>.png (<map>-2.png, ... for repeated names)")
+    parser.add_argument("--coverage", action="store_true", help="plan full-coverage tours instead of the A* sweep")
+    parser.add_argument("--trace-memory", action="store_true", help="measure the peak Python allocations of every solve")
+    parser.add_argument("--peak-rss", action="store_true",
+                        help="record every map's peak RSS; off by default because it needs a fresh worker "
+                             "process per map (see --trace-memory for a per-map peak without it)")
+    parser.add_argument("--cache", metavar="DIR", help="compile the maps into DIR once and load them from there")
+    args = parser.parse_args(argv)
+
+    maps = find_maps(args.maps)
+    if not maps:
+        sys.exit("No maps found")
+    if args.images is not None:
+        os.makedirs(args.images, exist_ok=True)
+
+    images = [os.path.join(args.images, name) for name in image_names(maps)] if args.images is not None else [None] * len(maps)
+    jobs = [(path, image, args.coverage, args.trace_memory, args.cache, args.peak_rss)
+            for path, image in zip(maps, images)]
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        # imap hands results back in submission order, so the output does not depend on
+        # which worker finishes first, while each line is still written as soon as it can be.
+        # A worker's peak RSS covers every map it has solved, so --peak-rss retires workers after one map.
+        with Pool(processes=min(args.jobs, len(jobs)), maxtasksperchild=1 if args.peak_rss else None) as pool:
+            for result in pool.imap(solve_map, jobs):
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
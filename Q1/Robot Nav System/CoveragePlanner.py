@@ -0,0 +1,381 @@
+import heapq
+from array import array
+
+import numpy as np
+import Grid as g
+import NodePool as npool
+
+UNREACHED = -1  # Distance stored for cells a sweep has not reached
+CANDIDATES = 10  # Nearest other points every dirt cell is swept to when the tour is approximate
+BUCKETS = int(g.STEP_COSTS.max()) + 1  # Step costs are small integers, so the sweeps use a circular bucket queue
+
+
+class CoveragePlanner():
+    def __init__(self, grid, start, dirt, max_exact=20):
+        # Plans a tour from the start that cleans every dirt cell.
+        # Up to max_exact dirt cells, the shortest-path costs between the start and all dirt cells are
+        # computed with one Dijkstra sweep per point and the tour is searched over (position, remaining
+        # dirt) states. Above that an approximate tour is built from sweeps that stop at the nearest
+        # CANDIDATES points. Only costs between points are kept; the paths of the tour are searched
+        # again leg by leg once the order is known.
+        self.grid = grid
+        self.start = start
+        self.dirt = list(dirt)
+        self.max_exact = max_exact
+        self.reached = bytearray(grid.height * grid.width)  # Cells settled by any sweep or leg search
+        self.num_explored = 0         # (position, remaining dirt) states expanded by the exact search
+
+    def sweep(self, source, targets=None, count=None):
+        # Dijkstra from a source cell over the step costs of the grid, with a bucket queue.
+        # Stops once count of the target cells (default: all of them) have been settled, or nothing
+        # reachable is left; targets defaults to the start and every dirt cell.
+        # Returns the distance array and the settled targets, nearest first. Distances are final for
+        # every settled cell, upper bounds for cells still queued, and UNREACHED everywhere else.
+        if targets is None:
+            targets = [self.start] + self.dirt
+        remaining = set(targets)
+        remaining.discard(source)
+        if count is None:
+            count = len(remaining)
+
+        width = self.grid.width
+        last_row = self.grid.height - 1
+        last_col = width - 1
+        cells = self.grid.cell_buffer
+        class_costs = g.CLASS_COSTS
+        reached = self.reached
+        dist = array("q", [UNREACHED]) * len(reached)
+        buckets = [[] for _ in range(BUCKETS)]
+        found = []
+
+        dist[source] = 0
+        buckets[0].append(source)
+        pending = 1
+        cost = 0
+        while pending and len(found) < count:
+            bucket = buckets[cost % BUCKETS]
+            while bucket and len(found) < count:
+                cell = bucket.pop()
+                pending -= 1
+                if dist[cell] != cost:
+                    continue  # Queued again later with a lower cost and settled then
+                reached[cell] = 1
+                if cell in remaining:
+                    remaining.discard(cell)
+                    found.append(cell)
+                row, col = divmod(cell, width)
+                for neighbor in (cell - width if row else -1, cell + width if row < last_row else -1,
+                                 cell - 1 if col else -1, cell + 1 if col < last_col else -1):
+                    if neighbor < 0:
+                        continue
+                    step = class_costs[cells[neighbor]]
+                    if not step:
+                        continue
+                    new_cost = cost + step
+                    if dist[neighbor] == UNREACHED or new_cost < dist[neighbor]:
+                        dist[neighbor] = new_cost
+                        buckets[new_cost % BUCKETS].append(neighbor)
+                        pending += 1
+            cost += 1
+        return dist, found
+
+    def reverse_cost(self, source, target, cost):
+        # Cost from target back to source, given the cost from source to target. A step costs what the
+        # entered cell costs, so walking a path backwards pays for the source instead of the target,
+        # and the reverse of a cheapest path is a cheapest path too.
+        return cost - self.grid.cost(target) + self.grid.cost(source)
+
+    def cost_matrix(self):
+        # Pairwise path costs between the points of the tour: index 0 is the start, then the dirt cells.
+        # Costs are asymmetric because a step costs whatever the entered cell costs; every point is swept
+        # to the points after it and the costs back are derived with reverse_cost().
+        points = [self.start] + self.dirt
+        matrix = [[0] * len(points) for _ in points]
+        for i, source in enumerate(points[:-1]):
+            later = points[i + 1:]
+            dist, found = self.sweep(source, later)
+            if len(found) < len(later):
+                raise Exception("no solution")
+            for j, target in enumerate(later, i + 1):
+                matrix[i][j] = dist[target]
+                matrix[j][i] = self.reverse_cost(source, target, dist[target])
+        return matrix
+
+    def plan(self):
+        # Order in which to clean the dirt cells, as a list of dirt cell IDs, and the tour cost
+        if not self.dirt:
+            return [], 0
+        if len(self.dirt) <= self.max_exact:
+            order, cost = self._exact_tour(self.cost_matrix())
+        else:
+            order, cost = self._approximate_tour(*self._candidate_costs())
+        return [self.dirt[point - 1] for point in order], cost
+
+    def path(self, order):
+        # Search the cheapest path of every leg of the tour again and stitch them into one path.
+        # Returns the actions and cells of the path like NodePool.path().
+        actions = []
+        cells = []
+        current = self.start
+        for target in order:
+            _, leg = self._leg(current, target)
+            previous = current
+            for cell in leg:
+                actions.append(self._action(previous, cell))
+                cells.append(cell)
+                previous = cell
+            current = target
+        return actions, cells
+
+    def explored_cells(self):
+        # Cells reached by any of the sweeps or leg searches
+        return set(np.flatnonzero(np.frombuffer(self.reached, dtype=np.uint8)).tolist())
+
+    def _leg(self, source, target):
+        # Cheapest path between two cells with A*. Every step costs at least 1, so the Manhattan
+        # distance never overestimates. Returns the cost and the cells after the source.
+        width = self.grid.width
+        target_row, target_col = divmod(target, width)
+        source_row, source_col = divmod(source, width)
+        last_row = self.grid.height - 1
+        last_col = width - 1
+        cells = self.grid.cell_buffer
+        class_costs = g.CLASS_COSTS
+        best = {source: 0}
+        parent = {source: None}
+        heap = [(abs(source_row - target_row) + abs(source_col - target_col), 0, source)]
+        while heap:
+            _, cost, cell = heapq.heappop(heap)
+            if cost > best[cell]:
+                continue
+            self.reached[cell] = 1
+            if cell == target:
+                break
+            row, col = divmod(cell, width)
+            for neighbor, moved_row, moved_col in ((cell - width if row else -1, row - 1, col),
+                                                   (cell + width if row < last_row else -1, row + 1, col),
+                                                   (cell - 1 if col else -1, row, col - 1),
+                                                   (cell + 1 if col < last_col else -1, row, col + 1)):
+                if neighbor < 0:
+                    continue
+                step = class_costs[cells[neighbor]]
+                if not step:
+                    continue
+                new_cost = cost + step
+                if new_cost < best.get(neighbor, new_cost + 1):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = cell
+                    heapq.heappush(heap, (new_cost + abs(moved_row - target_row) + abs(moved_col - target_col),
+                                          new_cost, neighbor))
+        if target not in best:
+            raise Exception("no solution")
+        leg = []
+        cell = target
+        while cell != source:
+            leg.append(cell)
+            cell = parent[cell]
+        leg.reverse()
+        return best[target], leg
+
+    def _candidate_costs(self):
+        # Costs for the approximate tour without sweeping every point to every other one. The start is
+        # swept to all dirt (which also finds out whether all of it is reachable); every dirt cell is
+        # swept only until it has settled its CANDIDATES nearest points. Costs between other pairs are
+        # searched with _leg() when the tour needs them and cached.
+        # Returns a cost(a, b) function over point indices, a lower(a, b) bound on it that never searches,
+        # and every point's candidate list, nearest first.
+        points = [self.start] + self.dirt
+        index = {cell: point for point, cell in enumerate(points)}
+        known = {}
+        candidates = []
+        for point, source in enumerate(points):
+            dist, found = self.sweep(source, points, None if point == 0 else CANDIDATES)
+            if point == 0 and len(found) < len(points) - 1:
+                raise Exception("no solution")
+            for target in found:
+                other = index[target]
+                known[point, other] = dist[target]
+                known[other, point] = self.reverse_cost(source, target, dist[target])
+            candidates.append([index[target] for target in found])
+
+        def cost(a, b):
+            if a == b:
+                return 0
+            value = known.get((a, b))
+            if value is None:
+                value, _ = self._leg(points[a], points[b])
+                known[a, b] = value
+                known[b, a] = self.reverse_cost(points[a], points[b], value)
+            return value
+
+        width = self.grid.width
+
+        def lower(a, b):
+            # The known cost, or else the Manhattan distance, as every step costs at least 1
+            value = known.get((a, b))
+            if value is None:
+                (row_a, col_a), (row_b, col_b) = divmod(points[a], width), divmod(points[b], width)
+                value = abs(row_a - row_b) + abs(col_a - col_b)
+            return value
+
+        return cost, lower, candidates
+
+    def _action(self, cell, next_cell):
+        # Name of the move between two adjacent cells
+        difference = next_cell - cell
+        if difference == -self.grid.width:
+            return npool.ACTIONS[0]
+        if difference == self.grid.width:
+            return npool.ACTIONS[1]
+        if difference == -1:
+            return npool.ACTIONS[2]
+        return npool.ACTIONS[3]
+
+    def _exact_tour(self, matrix):
+        # A* over (position, remaining dirt bitmask) states. Point 0 is the start, dirt i is point i + 1.
+        # The heuristic is the cheapest edge from the position into the remaining dirt plus the
+        # minimum spanning tree of the remaining dirt under min(d(i, j), d(j, i)), which never
+        # overestimates the cost of any path that visits them all.
+        count = len(self.dirt)
+        symmetric = [[min(matrix[i][j], matrix[j][i]) for j in range(count + 1)] for i in range(count + 1)]
+        mst_cache = {0: 0}
+
+        # Dirt cells sorted by cost from every point, so the nearest remaining one is found early
+        by_cost = [sorted(range(count), key=lambda i: matrix[point][i + 1]) for point in range(count + 1)]
+
+        def spanning_tree(mask):
+            # Prim's algorithm over the dirt cells in the mask, cached per mask
+            total = mst_cache.get(mask)
+            if total is not None:
+                return total
+            points = [i + 1 for i in range(count) if mask >> i & 1]
+            row = symmetric[points.pop()]
+            keys = [row[point] for point in points]
+            total = 0
+            while points:
+                key = min(keys)
+                best = keys.index(key)
+                total += key
+                row = symmetric[points[best]]
+                points[best] = points[-1]
+                keys[best] = keys[-1]
+                points.pop()
+                keys.pop()
+                keys = [key if key < row[point] else row[point] for key, point in zip(keys, points)]
+            mst_cache[mask] = total
+            return total
+
+        def nearest(position, mask):
+            # Cheapest edge from the position into the remaining dirt
+            for i in by_cost[position]:
+                if mask >> i & 1:
+                    return matrix[position][i + 1]
+            return 0
+
+        # States are queued with the cheap nearest-edge bound and only get the spanning tree
+        # added when they reach the top of the queue, so most queued states never pay for Prim.
+        # The approximate tour gives an upper bound: states that cannot beat it are dropped,
+        # and if every state is dropped the approximate tour was already optimal.
+        everyone = [sorted(range(count + 1), key=matrix[point].__getitem__) for point in range(count + 1)]
+        lookup = lambda a, b: matrix[a][b]
+        bound_order, bound = self._approximate_tour(lookup, lookup, everyone)
+        full = (1 << count) - 1
+        best_cost = {(0, full): 0}
+        parents = {(0, full): None}
+        tie = 0
+        heap = [(0, tie, 0, 0, full, False)]
+        self.num_explored = 0
+        while heap:
+            key, _, cost, position, mask, complete = heapq.heappop(heap)
+            if cost > best_cost[(position, mask)]:
+                continue
+            if not complete and mask:
+                f_cost = cost + nearest(position, mask) + spanning_tree(mask)
+                if f_cost >= bound:
+                    continue
+                if f_cost > key:
+                    tie += 1
+                    heapq.heappush(heap, (f_cost, tie, cost, position, mask, True))
+                    continue
+            self.num_explored += 1
+            if not mask:
+                order = []
+                state = (position, mask)
+                while parents[state] is not None:
+                    order.append(state[0])
+                    state = parents[state]
+                order.reverse()
+                return order, cost
+
+            row = matrix[position]
+            for i in range(count):
+                if not mask >> i & 1:
+                    continue
+                state = (i + 1, mask & ~(1 << i))
+                new_cost = cost + row[i + 1]
+                if new_cost < best_cost.get(state, new_cost + 1):
+                    f_cost = new_cost + nearest(*state)
+                    if f_cost >= bound:
+                        continue
+                    best_cost[state] = new_cost
+                    parents[state] = (position, mask)
+                    tie += 1
+                    heapq.heappush(heap, (f_cost, tie, new_cost, state[0], state[1], False))
+        return bound_order, bound
+
+    def _approximate_tour(self, cost, lower, candidates):
+        # Nearest-neighbour tour improved by relocating single dirt cells until no move helps.
+        # cost(a, b) is the path cost between two points, lower(a, b) a cheap bound that is never above it,
+        # and candidates[a] the points worth placing next to a, nearest first: a dirt cell is only tried
+        # right after or right before its candidates, and a move is only costed exactly if its bound helps.
+        # Moves are scored in O(1) from the edges they change, so asymmetric costs are handled.
+        count = len(self.dirt)
+        points = [self.start] + self.dirt
+        unvisited = set(range(1, count + 1))
+        tour = [0]
+        while unvisited:
+            current = tour[-1]
+            point = next((other for other in candidates[current] if other in unvisited), None)
+            if point is None:
+                # Every candidate is in the tour already; sweep on to the nearest remaining dirt cell
+                _, found = self.sweep(points[current], [points[other] for other in unvisited], 1)
+                point = points.index(found[0])
+            unvisited.remove(point)
+            tour.append(point)
+
+        def edge(a, b):
+            # Cost of moving between tour positions a and b; leaving the end of the tour is free
+            return cost(tour[a], tour[b]) if b < len(tour) else 0
+
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(tour)):
+                # Saving from taking tour[i] out from between its neighbours
+                removed = edge(i - 1, i) + edge(i, i + 1) - (cost(tour[i - 1], tour[i + 1]) if i + 1 < len(tour) else 0)
+                point = tour[i]
+                positions = set()
+                for other in candidates[point]:
+                    j = tour.index(other)
+                    positions.add(j)          # Right after the candidate
+                    if j > 0:
+                        positions.add(j - 1)  # Right before it
+                for j in sorted(positions):
+                    if j == i or j == i - 1:
+                        continue
+                    after = tour[j + 1] if j + 1 < len(tour) else None
+                    if after is None:
+                        added = cost(tour[j], point)
+                    else:
+                        kept = cost(tour[j], after)
+                        if lower(tour[j], point) + lower(point, after) - kept >= removed:
+                            continue
+                        added = cost(tour[j], point) + cost(point, after) - kept
+                    if added < removed:
+                        tour.pop(i)
+                        tour.insert(j + 1 if j < i else j, point)
+                        improved = True
+                        break
+
+        total = sum(cost(a, b) for a, b in zip(tour, tour[1:]))
+        return tour[1:], total
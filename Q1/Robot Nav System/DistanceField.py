@@ -0,0 +1,123 @@
+import heapq
+from array import array
+from collections import deque
+
+INFINITY = 2 ** 31 - 1  # Distance stored for cells with no source left
+
+
+class DistanceField():
+    def __init__(self, height, width, sources):
+        # Multi-source Manhattan distance field over a height x width grid of flat cell IDs.
+        # Every cell stores the distance to its nearest source and which source that is,
+        # so lookups are O(1) and removing a source only repairs the cells it owned.
+        # A cell is a source exactly when it is labelled with itself, so only the number of sources is kept.
+        self.height = height
+        self.width = width
+        size = height * width
+        self.dist = array("i", [INFINITY]) * size   # Distance to the nearest source
+        self.label = array("i", [-1]) * size        # Flat index of that nearest source
+        self.count = 0                              # Number of sources left
+
+        # Breadth-first search from all sources at once; walls are ignored on purpose,
+        # which makes every distance equal to the Manhattan distance to the nearest source
+        queue = deque()
+        for index in sources:
+            if self.label[index] == index:
+                continue
+            self.count += 1
+            self.dist[index] = 0
+            self.label[index] = index
+            queue.append(index)
+        self._spread(queue)
+
+    @classmethod
+    def from_arrays(cls, height, width, dist, label, count, copy=True):
+        # Field with count sources from int32 distance and label arrays computed earlier (a compiled map),
+        # without the search. The arrays are copied, so the field can be repaired without touching them;
+        # with copy=False they are used in place (e.g. memory-mapped) and the field is read-only.
+        field = cls.__new__(cls)
+        field.height = height
+        field.width = width
+        if copy:
+            field.dist = array("i")
+            field.dist.frombytes(memoryview(dist).cast("B"))
+            field.label = array("i")
+            field.label.frombytes(memoryview(label).cast("B"))
+        else:
+            field.dist = memoryview(dist).cast("B").cast("i")
+            field.label = memoryview(label).cast("B").cast("i")
+        field.count = count
+        return field
+
+    def _neighbors(self, index):
+        # Flat indices of the 4-connected neighbours of a cell
+        width = self.width
+        r, c = divmod(index, width)
+        if r > 0:
+            yield index - width
+        if r < self.height - 1:
+            yield index + width
+        if c > 0:
+            yield index - 1
+        if c < width - 1:
+            yield index + 1
+
+    def _spread(self, queue):
+        # Breadth-first expansion from cells whose distance is already final
+        dist = self.dist
+        label = self.label
+        while queue:
+            index = queue.popleft()
+            next_dist = dist[index] + 1
+            for neighbor in self._neighbors(index):
+                if dist[neighbor] == INFINITY:
+                    dist[neighbor] = next_dist
+                    label[neighbor] = label[index]
+                    queue.append(neighbor)
+
+    def distance(self, cell):
+        # Distance from a flat cell ID to the nearest remaining source, 0 if none is left
+        if not self.count:
+            return 0
+        return self.dist[cell]
+
+    def remove(self, index):
+        # Remove a source cell and repair only the cells that were closest to it
+        if self.label[index] != index:
+            return
+        self.count -= 1
+        dist = self.dist
+        label = self.label
+
+        # Collect the region owned by the removed source; it is connected because
+        # every cell inherited its label from a neighbour during the search
+        region = [index]
+        dist[index] = INFINITY
+        label[index] = -1
+        i = 0
+        while i < len(region):
+            for neighbor in self._neighbors(region[i]):
+                if label[neighbor] == index:
+                    dist[neighbor] = INFINITY
+                    label[neighbor] = -1
+                    region.append(neighbor)
+            i += 1
+
+        # Seed the repair with the surrounding cells that still have a source
+        heap = []
+        for cell in region:
+            for neighbor in self._neighbors(cell):
+                if label[neighbor] != -1:
+                    heapq.heappush(heap, (dist[neighbor] + 1, neighbor, cell))
+
+        # Dijkstra restricted to the region; costs are uniform, so the first
+        # time a cell is popped its distance is final
+        while heap:
+            new_dist, parent, cell = heapq.heappop(heap)
+            if label[cell] != -1:
+                continue
+            dist[cell] = new_dist
+            label[cell] = label[parent]
+            for neighbor in self._neighbors(cell):
+                if label[neighbor] == -1:
+                    heapq.heappush(heap, (new_dist + 1, cell, neighbor))
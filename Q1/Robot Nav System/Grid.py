@@ -0,0 +1,89 @@
+import numpy as np
+
+# Cell classes stored in the packed grid
+EMPTY = 0
+WALL = 1
+CARPET = 2
+DIRT = 3
+START = 4
+
+# Map characters and the cell class they parse to; anything else is a wall
+CELL_CLASSES = {" ": EMPTY, "#": WALL, "X": CARPET, "+": DIRT, "A": START}
+CELL_CHARS = {cls: char for char, cls in CELL_CLASSES.items()}
+
+# Cost of stepping onto a cell of each class, indexed by class (0 means impassable)
+STEP_COSTS = np.array([1, 0, 5, 3, 1], dtype=np.uint8)
+CLASS_COSTS = tuple(STEP_COSTS.tolist())  # The same costs as a tuple, which is faster to index one cell at a time
+
+
+class Grid():
+    def __init__(self, height, width, cells, copy=True):
+        # Packed map: one uint8 cell class per cell, addressed by the flat cell ID row * width + col.
+        # The bytearray backs the NumPy view, so the solver can index single cells cheaply
+        # while bulk operations (rendering, searches for dirt) stay vectorized.
+        # Step costs are not stored; they are looked up from the cell class in CLASS_COSTS.
+        # With copy=False the cells (a C-contiguous uint8 buffer, e.g. a memory-mapped array) are used
+        # in place and read-only, so processes mapping the same file share one copy.
+        self.height = height
+        self.width = width
+        self.cell_buffer = bytearray(cells) if copy else memoryview(cells).cast("B")
+        self.cells = np.frombuffer(self.cell_buffer, dtype=np.uint8).reshape(height, width)
+
+        # Start is the last "A" in reading order and dirt is kept in reading order, like the text parser.
+        # Maps for several robots have one "A" per robot; starts lists them all in reading order.
+        starts = np.flatnonzero(self.cells == START)
+        self.start = int(starts[-1]) if len(starts) else None
+        self.starts = starts.tolist()
+        self.dirt = np.flatnonzero(self.cells == DIRT).tolist()
+
+    @property
+    def step_cost(self):
+        # Step cost of every cell as a (height, width) uint8 array, built when asked for
+        return STEP_COSTS[self.cells]
+
+    def cost(self, cell):
+        # Cost of stepping onto a cell, 0 if it is a wall
+        return CLASS_COSTS[self.cell_buffer[cell]]
+
+    @classmethod
+    def from_lines(cls, lines):
+        # Build a grid from the lines of a map file, padding short rows with empty space
+        height = len(lines)
+        width = max(len(line) for line in lines)
+        cells = bytearray()
+        for line in lines:
+            cells.extend(CELL_CLASSES.get(char, WALL) for char in line)
+            cells.extend(bytes(width - len(line)))  # EMPTY is 0
+        return cls(height, width, cells)
+
+    def cell(self, row, col):
+        # Flat cell ID of a (row, col) position
+        return row * self.width + col
+
+    def coords(self, cell):
+        # (row, col) position of a flat cell ID
+        return divmod(cell, self.width)
+
+    def neighbors(self, cell):
+        # Passable 4-connected neighbours of a cell as (action, cell, step cost) triples
+        width = self.width
+        cells = self.cell_buffer
+        row, col = divmod(cell, width)
+        result = []
+        if row > 0:
+            cost = CLASS_COSTS[cells[cell - width]]
+            if cost:
+                result.append(("up", cell - width, cost))
+        if row < self.height - 1:
+            cost = CLASS_COSTS[cells[cell + width]]
+            if cost:
+                result.append(("down", cell + width, cost))
+        if col > 0:
+            cost = CLASS_COSTS[cells[cell - 1]]
+            if cost:
+                result.append(("left", cell - 1, cost))
+        if col < width - 1:
+            cost = CLASS_COSTS[cells[cell + 1]]
+            if cost:
+                result.append(("right", cell + 1, cost))
+        return result
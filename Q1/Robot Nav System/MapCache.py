@@ -0,0 +1,178 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import DistanceField as df  # Importing the DistanceField whose arrays are precomputed
+import Grid as g  # Importing the packed Grid the artifacts are loaded into
+import MapLoader as ml  # Importing the MapLoader that parses the map files being compiled
+
+# Compiled map artifacts. A map file is compiled once into a directory of .npy arrays, named after the
+# SHA-256 of the file contents, inside a cache directory:
+#   cells.npy                          packed cell classes, (height, width) uint8
+#   starts.npy, dirt.npy               flat cell IDs in reading order
+#   dirt_dist.npy, dirt_label.npy      nearest-dirt DistanceField, int32 per cell
+#   wall_dist.npy, wall_label.npy      wall-clearance DistanceField, int32 per cell
+#   meta.json                          format version, content hash, map size, wall count and the dtype
+#                                      and shape of every array, written last
+# Artifacts are opened with memory mapping, so repeated solves and parallel workers read one copy from
+# the page cache instead of parsing the map again: the grid and the wall-clearance field index the mapped
+# arrays in place, and only the nearest-dirt field, which every solve repairs, is copied.
+# Editing a map changes its hash and so its artifact; an artifact with another format version, a hash
+# that does not match its name, or missing arrays is stale and compiled again. So is one whose arrays
+# cannot be opened or do not have the dtype and shape recorded in meta.json, such as a truncated or
+# overwritten .npy file.
+
+FORMAT_VERSION = 4
+ARRAYS = ("cells", "starts", "dirt", "dirt_dist", "dirt_label", "wall_dist", "wall_label")
+DEFAULT_CACHE_DIR = os.environ.get("ROBOT_MAP_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "robot-nav-maps"))
+
+
+def file_hash(filename):
+    # SHA-256 of a file's contents as hex
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_current(directory, digest):
+    # Whether a directory holds a complete artifact of this format for the contents with this hash
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (meta.get("version") == FORMAT_VERSION and meta.get("hash") == digest
+            and all(os.path.exists(os.path.join(directory, name + ".npy")) for name in ARRAYS))
+
+
+def compile_map(filename, cache_dir=DEFAULT_CACHE_DIR, digest=None):
+    # Parse a map, precompute its distance fields and write the artifact. The files are written to a
+    # temporary directory that is renamed into place, so readers never see a half-written artifact.
+    # Returns the artifact directory.
+    digest = digest or file_hash(filename)
+    directory = os.path.join(cache_dir, digest)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    grid = ml.load_grid(filename)
+    walls = np.flatnonzero(grid.cells == g.WALL).tolist()
+    dirt_field = df.DistanceField(grid.height, grid.width, grid.dirt)
+    wall_field = df.DistanceField(grid.height, grid.width, walls)
+    arrays = {
+        "cells": grid.cells,
+        "starts": np.array(grid.starts, dtype=np.int64),
+        "dirt": np.array(grid.dirt, dtype=np.int64),
+        "dirt_dist": np.frombuffer(dirt_field.dist, dtype=np.int32),
+        "dirt_label": np.frombuffer(dirt_field.label, dtype=np.int32),
+        "wall_dist": np.frombuffer(wall_field.dist, dtype=np.int32),
+        "wall_label": np.frombuffer(wall_field.label, dtype=np.int32),
+    }
+
+    staging = tempfile.mkdtemp(prefix=".compile-", dir=cache_dir)
+    os.chmod(staging, 0o755)  # mkdtemp makes it private; other users' workers may share the cache
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, name + ".npy"), array)
+        meta = {
+            "version": FORMAT_VERSION,
+            "hash": digest,
+            "source": os.path.abspath(filename),
+            "height": grid.height,
+            "width": grid.width,
+            "walls": len(walls),
+            "arrays": {name: {"dtype": array.dtype.str, "shape": list(array.shape)} for name, array in arrays.items()},
+            "compiled": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        if is_current(directory, digest):
+            return directory  # Another process compiled the same map meanwhile
+        if os.path.exists(directory):
+            shutil.rmtree(directory, ignore_errors=True)  # A stale artifact
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another process put the same artifact in place first
+            if not is_current(directory, digest):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+
+def load(filename, cache_dir=DEFAULT_CACHE_DIR):
+    # Artifact of a map file, compiled first when there is none or it is stale
+    digest = file_hash(filename)
+    directory = os.path.join(cache_dir, digest)
+    if not is_current(directory, digest):
+        compile_map(filename, cache_dir, digest)
+    try:
+        return MapArtifact(directory)
+    except (OSError, ValueError):
+        # Damaged arrays: throw the artifact away and compile it again
+        shutil.rmtree(directory, ignore_errors=True)
+        compile_map(filename, cache_dir, digest)
+        return MapArtifact(directory)
+
+
+class MapArtifact():
+    def __init__(self, directory):
+        # Open a compiled map; every array is memory-mapped read-only. Raises ValueError when an array
+        # cannot be mapped or does not have the dtype and shape recorded in meta.json.
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.height = self.meta["height"]
+        self.width = self.meta["width"]
+        for name in ARRAYS:
+            array = np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+            spec = self.meta["arrays"][name]
+            if array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+                raise ValueError("array %s of %s is %s %s, expected %s %s" % (
+                    name, directory, array.dtype.str, list(array.shape), spec["dtype"], spec["shape"]))
+            setattr(self, name, array)
+
+    def grid(self):
+        # Read-only Grid of the map over the mapped cell classes
+        return g.Grid(self.height, self.width, self.cells, copy=False)
+
+    def dirt_field(self):
+        # A fresh nearest-dirt DistanceField, ready to have dirt removed as it is cleaned
+        return df.DistanceField.from_arrays(self.height, self.width, self.dirt_dist, self.dirt_label, len(self.dirt))
+
+    def wall_field(self):
+        # The wall-clearance DistanceField, read-only over the mapped arrays; walls are never removed
+        return df.DistanceField.from_arrays(self.height, self.width, self.wall_dist, self.wall_label,
+                                            self.meta["walls"], copy=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile map files into cached binary artifacts.")
+    parser.add_argument("maps", nargs="+", help="map files to compile")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="cache directory (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="compile again even if the artifact is current")
+    args = parser.parse_args(argv)
+    for filename in args.maps:
+        digest = file_hash(filename)
+        directory = os.path.join(args.cache, digest)
+        if not args.force and is_current(directory, digest):
+            try:
+                MapArtifact(directory)
+            except (OSError, ValueError):
+                pass  # Damaged arrays; compiled again below
+            else:
+                print("current ", filename, "->", directory)
+                continue
+        shutil.rmtree(directory, ignore_errors=True)
+        compile_map(filename, args.cache, digest)
+        print("compiled", filename, "->", directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+from collections import deque
+
+import numpy as np
+
+MAX_SIZE = 5000  # Largest height or width the generator accepts
+
+
+def generate_map(height, width, wall_density=0.2, carpet_density=0.1, dirt_count=10, seed=0, robots=1):
+    # Generate a random map as a list of text lines in the format Robot reads.
+    # The border is walled in; walls and carpet ("X") are scattered with the given densities;
+    # the start ("A") and the dirt ("+") are placed on free cells connected to each other,
+    # so every generated map can be solved. The same seed always gives the same map.
+    # With robots > 1 the extra starts for MultiRobot are placed after the dirt, on other
+    # connected cells, so the rest of the map is the same as for a single robot.
+    if not (3 <= height <= MAX_SIZE and 3 <= width <= MAX_SIZE):
+        raise ValueError("height and width must be between 3 and %d" % MAX_SIZE)
+    rng = np.random.default_rng(seed)
+
+    cells = np.full((height, width), ord(" "), dtype=np.uint8)
+    roll = rng.random((height, width))
+    cells[roll < wall_density + carpet_density] = ord("X")
+    cells[roll < wall_density] = ord("#")
+    cells[0, :] = cells[-1, :] = cells[:, 0] = cells[:, -1] = ord("#")
+
+    # Start on a random free cell and keep only the cells reachable from it as dirt candidates
+    free = np.flatnonzero(cells.ravel() != ord("#"))
+    if len(free) == 0:
+        raise ValueError("wall density leaves no free cell")
+    start = int(free[rng.integers(len(free))])
+    reachable = _reachable(cells, start)
+    reachable[start] = 0
+    candidates = np.flatnonzero(reachable)
+    if dirt_count + robots - 1 > len(candidates):
+        raise ValueError("only %d cells are reachable for %d dirt cells and %d robots"
+                         % (len(candidates), dirt_count, robots))
+
+    flat = cells.ravel()
+    dirt = rng.choice(candidates, size=dirt_count, replace=False)
+    flat[dirt] = ord("+")
+    flat[start] = ord("A")
+    if robots > 1:
+        flat[rng.choice(np.setdiff1d(candidates, dirt), size=robots - 1, replace=False)] = ord("A")
+    return [row.tobytes().decode("ascii") for row in cells]
+
+
+def _reachable(cells, start):
+    # Breadth-first flood fill from the start over the non-wall cells.
+    # Returns a boolean array over the flat cell IDs marking the reachable cells.
+    width = cells.shape[1]
+    passable = bytearray((cells.ravel() != ord("#")).tobytes())
+    seen = bytearray(len(passable))
+    seen[start] = 1
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for neighbor in (cell - width, cell + width, cell - 1, cell + 1):
+            # The border is all wall, so neighbours of passable cells never leave the grid
+            if passable[neighbor] and not seen[neighbor]:
+                seen[neighbor] = 1
+                queue.append(neighbor)
+    return np.frombuffer(seen, dtype=np.bool_).copy()
+
+
+def write_map(filename, height, width, wall_density=0.2, carpet_density=0.1, dirt_count=10, seed=0, robots=1):
+    # Generate a map and save it to a file
+    lines = generate_map(height, width, wall_density, carpet_density, dirt_count, seed, robots)
+    with open(filename, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded random map for Robot.py.")
+    parser.add_argument("output", help="file to write the map to")
+    parser.add_argument("--height", type=int, default=50)
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--walls", type=float, default=0.2, help="fraction of cells that are walls")
+    parser.add_argument("--carpet", type=float, default=0.1, help="fraction of cells that are carpet")
+    parser.add_argument("--dirt", type=int, default=10, help="number of dirt cells")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--robots", type=int, default=1, help="number of robot starts, for MultiRobot.py")
+    args = parser.parse_args(argv)
+    write_map(args.output, args.height, args.width, args.walls, args.carpet, args.dirt, args.seed, args.robots)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import mmap
+import os
+
+import numpy as np
+import Grid as g
+
+# Bytes that str.splitlines() treats as line breaks when the map is pure ASCII ("\r\n" counts once)
+LINE_BREAKS = b"\n\r\x0b\x0c\x1c\x1d\x1e"
+
+# Cell class of every byte value; anything that is not a known map character is a wall
+CLASS_TABLE = np.full(256, g.WALL, dtype=np.uint8)
+for char, cls in g.CELL_CLASSES.items():
+    CLASS_TABLE[ord(char)] = cls
+
+BREAK_TABLE = np.zeros(256, dtype=np.bool_)
+BREAK_TABLE[list(LINE_BREAKS)] = True
+
+
+def load_grid(filename):
+    # Load a map file into a Grid by memory-mapping it and translating the bytes in bulk.
+    # Produces exactly the grid Grid.from_lines() builds from the text of the file.
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return g.Grid.from_lines([])  # Fails the same way the text parser does
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = np.frombuffer(mapped, dtype=np.uint8)
+            try:
+                if (data >= 0x80).any():
+                    # Multi-byte characters count as one column in the text parser; leave those maps to it
+                    grid = None
+                else:
+                    grid = _parse(data)
+            finally:
+                del data  # Release the buffer so the map can be closed
+    if grid is None:
+        with open(filename) as f:
+            grid = g.Grid.from_lines(f.read().splitlines())
+    return grid
+
+
+def _parse(data):
+    # Split the bytes into lines with vectorized searches and translate them to cell classes
+    size = len(data)
+    breaks = np.flatnonzero(BREAK_TABLE[data])
+
+    # A "\n" straight after a "\r" ends the same line; drop it and let the next line start after it
+    pairs = (data[breaks[:-1]] == ord("\r")) & (data[breaks[1:]] == ord("\n")) & (breaks[1:] == breaks[:-1] + 1)
+    crlf = breaks[:-1][pairs]
+    breaks = np.setdiff1d(breaks, crlf + 1, assume_unique=True)
+    starts = np.empty(len(breaks) + 1, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = breaks + 1
+    starts[1:][np.isin(breaks, crlf)] += 1
+
+    ends = np.append(breaks, size)
+    if starts[-1] >= size:
+        # A final line break does not start another line
+        starts = starts[:-1]
+        ends = ends[:-1]
+    lengths = ends - starts
+    height = len(starts)
+    width = int(lengths.max())
+
+    if width and np.all(lengths == width) and (height == 1 or np.all(np.diff(starts) == width + 1)):
+        # Rectangular map with single-byte line breaks: view the rows in place and translate at once
+        rows = np.lib.stride_tricks.as_strided(data, shape=(height, width), strides=(width + 1, 1))
+        cells = CLASS_TABLE[rows]
+    else:
+        # Ragged rows are padded with empty space, which is class 0
+        cells = np.zeros((height, width), dtype=np.uint8)
+        for row, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+            cells[row, :length] = CLASS_TABLE[data[start:start + length]]
+    return g.Grid(height, width, cells)
@@ -0,0 +1,148 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import CoveragePlanner as cp  # Importing the CoveragePlanner that plans each robot's cleaning tour
+import Grid as g  # Importing the packed Grid used to store the environment
+import MapLoader as ml  # Importing the MapLoader that reads map files into a Grid in bulk
+import Renderer as rd  # Importing the Renderer that draws the environment with NumPy and PIL
+
+_grid = None  # Grid of a worker process, unpacked once by the pool initializer
+
+
+def _init_worker(height, width, cells):
+    # Rebuild the map once per worker instead of sending it with every robot's job
+    global _grid
+    _grid = g.Grid(height, width, cells)
+
+
+def plan_robot(job):
+    # Plan one robot's cleaning tour over the dirt cells assigned to it
+    robot, start, dirt, max_exact = job
+    start_time = time.perf_counter()
+    planner = cp.CoveragePlanner(_grid, start, dirt, max_exact=max_exact)
+    order, cost = planner.plan()
+    actions, cells = planner.path(order)
+    return {
+        "robot": robot,
+        "start": start,
+        "order": order,
+        "cost": int(cost),
+        "actions": actions,
+        "cells": cells,
+        "num_explored": planner.num_explored,
+        "wall_time": round(time.perf_counter() - start_time, 6),
+    }
+
+
+class MultiRobot():
+    def __init__(self, filename):
+        # Load the map; every "A" in it is the start of one robot, in reading order
+        self.grid = ml.load_grid(filename)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.starts = self.grid.starts
+        self.dirt = self.grid.dirt
+        if not self.starts:
+            raise Exception("no robot start in the map")
+
+        self.assignment = None  # Dirt cells of every robot, set by partition()
+        self.plans = None       # Result record of every robot, set by solve()
+        self.makespan = 0       # Cost of the most expensive robot's tour
+        self.total_cost = 0     # Cost of all the tours together
+
+    def path_costs(self):
+        # Path cost from every robot's start to every dirt cell, one Dijkstra sweep per robot,
+        # as a (robots, dirt) array with infinity where a robot cannot reach a dirt cell
+        costs = np.empty((len(self.starts), len(self.dirt)))
+        for robot, start in enumerate(self.starts):
+            dist, _ = cp.CoveragePlanner(self.grid, start, self.dirt).sweep(start)
+            costs[robot] = [dist[cell] for cell in self.dirt]
+        costs[costs == cp.UNREACHED] = np.inf
+        return costs
+
+    def partition(self, rounds=200):
+        # Split the dirt among the robots. Every dirt cell goes to the robot with the lowest path cost
+        # to it plus a per-robot offset, so each robot gets a cluster of dirt that is near it along the
+        # floor. The offsets start at zero and are raised for robots with more than their share of the
+        # dirt and lowered for the others, until the cluster sizes differ by at most one cell or the
+        # rounds run out; the most even split seen is kept.
+        costs = self.path_costs()
+        if np.isinf(costs).all(axis=0).any():
+            raise Exception("no solution")
+        robots = len(self.starts)
+        if not len(self.dirt):
+            self.assignment = [[] for _ in range(robots)]
+            return self.assignment
+
+        share = len(self.dirt) / robots
+        finite = costs[np.isfinite(costs)]
+        step = max(float(np.median(finite)), 1.0) / 2  # Offsets move in steps of the typical path cost
+        offsets = np.zeros(robots)
+        best_owner, best_size = None, None
+        for _ in range(rounds):
+            owner = np.argmin(costs + offsets[:, None], axis=0)
+            sizes = np.bincount(owner, minlength=robots)
+            if best_size is None or sizes.max() < best_size:
+                best_owner, best_size = owner, sizes.max()
+            if sizes.max() - sizes.min() <= 1:
+                break
+            offsets += step * (sizes - share) / share
+            step *= 0.97  # Settle down instead of swapping boundary cells back and forth
+
+        self.assignment = [[self.dirt[i] for i in np.flatnonzero(best_owner == robot).tolist()]
+                           for robot in range(robots)]
+        return self.assignment
+
+    def solve(self, processes=None, max_exact=20):
+        # Partition the dirt and plan every robot's tour concurrently in a process pool.
+        # Tours are optimal for up to max_exact dirt cells per robot and approximate above that.
+        if self.assignment is None:
+            self.partition()
+        jobs = [(robot, start, dirt, max_exact) for robot, (start, dirt) in enumerate(zip(self.starts, self.assignment))]
+        if processes == 1 or len(jobs) == 1:
+            _init_worker(self.height, self.width, self.grid.cell_buffer)
+            plans = [plan_robot(job) for job in jobs]
+        else:
+            with Pool(processes=min(processes or os.cpu_count(), len(jobs)), initializer=_init_worker,
+                      initargs=(self.height, self.width, bytes(self.grid.cell_buffer))) as pool:
+                plans = pool.map(plan_robot, jobs)
+        self.plans = plans
+        self.makespan = max(plan["cost"] for plan in plans)
+        self.total_cost = sum(plan["cost"] for plan in plans)
+        self.num_explored = sum(plan["num_explored"] for plan in plans)
+        return plans
+
+    def output_image(self, filename, show_solution=True, cell_size=30, factor=1):
+        # Draw the map with every robot's start and each robot's path in its own colour
+        paths = [plan["cells"] for plan in self.plans] if self.plans is not None else ()
+        rd.render(self.grid, self.starts, filename, show_solution=show_solution,
+                  cell_size=cell_size, factor=factor, paths=paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split the dirt of a map among its robots and plan their tours in parallel.")
+    parser.add_argument("map", help="map file with one \"A\" per robot")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--max-exact", type=int, default=20, help="most dirt cells per robot planned optimally")
+    parser.add_argument("--image", help="also render the tours to this image file")
+    args = parser.parse_args(argv)
+
+    robots = MultiRobot(args.map)
+    start_time = time.perf_counter()
+    robots.solve(args.jobs, args.max_exact)
+    elapsed = time.perf_counter() - start_time
+    for plan in robots.plans:
+        row, col = robots.grid.coords(plan["start"])
+        print("Robot %d at (%d, %d): %d dirt, cost %d" % (plan["robot"], row, col, len(plan["order"]), plan["cost"]))
+    print("Makespan:", robots.makespan)
+    print("Total Cost:", robots.total_cost)
+    print("Planned in %.2fs" % elapsed)
+    if args.image:
+        robots.output_image(args.image)
+
+
+if __name__ == "__main__":
+    main()
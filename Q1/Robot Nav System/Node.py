@@ -1,4 +1,6 @@
 class Node():
+    __slots__ = ("state", "parent", "action", "cost", "f_cost")  # No per-instance __dict__
+
     def __init__(self, state, parent, action, cost, f_cost):
         self.state = state            
         self.parent = parent          
@@ -0,0 +1,41 @@
+from array import array
+
+import numpy as np
+
+# Actions are stored as small integer codes; -1 marks a cell without an action (the start)
+ACTIONS = ("up", "down", "left", "right")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class NodePool():
+    def __init__(self, size):
+        # Search nodes stored column-wise in preallocated typed arrays indexed by cell ID,
+        # instead of one Node object per reached state
+        self.parent = array("i", [-1]) * size     # Cell ID of the parent, -1 for none
+        self.cost = array("q", [0]) * size        # Path cost from the start
+        self.action = array("b", [-1]) * size     # Code of the action that reached the cell
+        self.closed = bytearray(size)             # 1 once the cell has been expanded
+
+    def set(self, state, parent, action, cost):
+        # Record the best known way of reaching a state
+        self.parent[state] = parent
+        self.action[state] = ACTION_CODES[action]
+        self.cost[state] = cost
+
+    def closed_cells(self):
+        # Cell IDs of the expanded states, as a NumPy array
+        return np.flatnonzero(np.frombuffer(self.closed, dtype=np.uint8))
+
+    def path(self, state):
+        # Walk the parent array back from a state to the start.
+        # Returns the actions and cells of the path, both in order from the start.
+        actions = []
+        cells = []
+        parent = self.parent
+        while parent[state] != -1:
+            actions.append(ACTIONS[self.action[state]])
+            cells.append(state)
+            state = parent[state]
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
@@ -1,4 +1,7 @@
 import heapq
+from collections import deque
+
+import numpy as np
 
 class PriorityQueueFrontier():
     def __init__(self):
@@ -21,4 +24,154 @@ class PriorityQueueFrontier():
         else:
             node = heapq.heappop(self.frontier)[1]      
             self.states.remove(node.state)                
-            return node
\ No newline at end of file
+            return node
+
+class BucketQueueFrontier():
+    # Dial-style bucket queue for small non-negative integer priorities.
+    # Frontier entries are (state, priority) pairs; changing the priority of a queued state
+    # leaves a stale entry behind in its old bucket, which remove() skips.
+    # Priorities must be Python ints: a fractional one would be truncated into the wrong bucket.
+    def __init__(self):
+        self.buckets = []             # buckets[f] holds the states queued with priority f, oldest first
+        self.priorities = {}          # Current priority of every queued state
+        self.cursor = 0               # Lowest bucket that may still hold a live entry
+        self.stale_pops = 0           # Entries skipped because their priority had changed
+
+    def add(self, state, priority):
+        # Queue a state, or move an already queued state to a new priority (decrease-key)
+        if self.priorities.get(state) == priority:
+            return
+        if type(priority) is not int:
+            raise TypeError("bucket queue priorities must be ints, got %r" % (priority,))
+        self.priorities[state] = priority
+        while len(self.buckets) <= priority:
+            self.buckets.append(deque())
+        self.buckets[priority].append(state)
+        if priority < self.cursor:
+            self.cursor = priority
+
+    def contains_state(self, state):
+        return state in self.priorities
+
+    def priority(self, state):
+        return self.priorities.get(state)
+
+    def empty(self):
+        return len(self.priorities) == 0
+
+    def __len__(self):
+        return len(self.priorities)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            bucket = self.buckets[self.cursor]
+            while bucket:
+                state = bucket.popleft()
+                if self.priorities.get(state) == self.cursor:
+                    del self.priorities[state]
+                    return state
+                self.stale_pops += 1
+            self.cursor += 1
+
+
+class IndexedHeapFrontier():
+    # Binary heap that knows the position of every state, so a queued state can be
+    # re-prioritised in place. Ties are broken by insertion order through a counter.
+    # Entries hold their (priority, counter) key as one tuple, so sifting compares keys without building any.
+    def __init__(self):
+        self.heap = []                # [(priority, counter), state] entries
+        self.index = {}               # Position of every queued state in the heap
+        self.counter = 0
+        self.stale_pops = 0           # Always 0, kept so both frontiers report the same counters
+
+    def add(self, state, priority):
+        # Queue a state, or move an already queued state to a new priority (decrease-key)
+        self.counter += 1
+        key = (priority, self.counter)
+        position = self.index.get(state)
+        if position is None:
+            self.heap.append([key, state])
+            self.index[state] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+        entry = self.heap[position]
+        old_priority = entry[0][0]
+        entry[0] = key
+        if priority < old_priority:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def contains_state(self, state):
+        return state in self.index
+
+    def priority(self, state):
+        position = self.index.get(state)
+        return None if position is None else self.heap[position][0][0]
+
+    def empty(self):
+        return len(self.heap) == 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        heap = self.heap
+        state = heap[0][1]
+        last = heap.pop()
+        del self.index[state]
+        if heap:
+            heap[0] = last
+            self.index[last[1]] = 0
+            self._sift_down(0)
+        return state
+
+    def _sift_up(self, position):
+        heap = self.heap
+        index = self.index
+        entry = heap[position]
+        key = entry[0]
+        while position > 0:
+            parent = (position - 1) >> 1
+            above = heap[parent]
+            if above[0] <= key:
+                break
+            heap[position] = above
+            index[above[1]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[1]] = position
+
+    def _sift_down(self, position):
+        heap = self.heap
+        index = self.index
+        size = len(heap)
+        entry = heap[position]
+        key = entry[0]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            below = heap[child]
+            if child + 1 < size and heap[child + 1][0] < below[0]:
+                child += 1
+                below = heap[child]
+            if key <= below[0]:
+                break
+            heap[position] = below
+            index[below[1]] = position
+            position = child
+        heap[position] = entry
+        index[entry[1]] = position
+
+
+def make_frontier(step_costs, heuristic_value):
+    # Pick the frontier for the kind of f-costs the search produces, from the step costs of the grid
+    # and a value of its heuristic: integer costs fit a bucket queue, anything else needs the indexed heap
+    if np.issubdtype(np.asarray(step_costs).dtype, np.integer) and type(heuristic_value) is int:
+        return BucketQueueFrontier()
+    return IndexedHeapFrontier()
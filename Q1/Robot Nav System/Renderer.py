@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import Grid as g
+from PIL import Image
+
+# Colour codes. When cells are merged while downsampling the code that comes first in PRECEDENCE wins.
+WALL_COLOR = 0
+START_COLOR = 1
+EXPLORED_DIRT_COLOR = 2
+SOLUTION_COLOR = 3
+EXPLORED_COLOR = 4
+CARPET_COLOR = 5
+EMPTY_COLOR = 6
+BORDER_COLOR = 7
+PATH_COLORS = tuple(range(8, 16))  # Paths of the robots of a multi-robot solution, cycled through
+
+PALETTE = np.array([
+    (40, 40, 40, 255),      # Dark gray for walls
+    (255, 0, 0, 255),       # Red for start
+    (255, 165, 0, 255),     # Orange for explored cells containing "+"
+    (220, 235, 113, 255),   # Light yellow for solution path
+    (212, 97, 85, 255),     # Light red for explored but not in solution path
+    (128, 0, 128, 255),     # Purple for carpet
+    (237, 240, 252, 255),   # Default light gray for empty space
+    (0, 0, 0, 255),         # Black cell borders
+    (31, 119, 180, 255),    # Blue, green, pink, teal, brown, olive, violet and cyan robot paths
+    (44, 160, 44, 255),
+    (247, 129, 191, 255),
+    (23, 190, 160, 255),
+    (140, 86, 75, 255),
+    (188, 189, 34, 255),
+    (148, 103, 189, 255),
+    (23, 190, 207, 255),
+], dtype=np.uint8)
+
+# Colour codes from the highest to the lowest precedence, and the position of every code in that order.
+# Robot paths rank with the single solution path.
+PRECEDENCE = np.array([WALL_COLOR, START_COLOR, EXPLORED_DIRT_COLOR, SOLUTION_COLOR] + list(PATH_COLORS)
+                      + [EXPLORED_COLOR, CARPET_COLOR, EMPTY_COLOR, BORDER_COLOR], dtype=np.uint8)
+RANK = np.argsort(PRECEDENCE).astype(np.uint8)
+
+
+def _cell_mask(grid, cells):
+    # Boolean (height, width) mask of an iterable (or NumPy array) of flat cell IDs
+    mask = np.zeros(grid.height * grid.width, dtype=np.bool_)
+    if len(cells):
+        mask[np.fromiter(cells, dtype=np.int64, count=len(cells))] = True
+    return mask.reshape(grid.height, grid.width)
+
+
+def color_codes(grid, start, solution=None, explored=(), show_solution=True, show_explored=False, paths=()):
+    # One colour code per cell, layered from the lowest to the highest precedence
+    # so that every cell ends up with the colour the per-cell renderer would pick.
+    # start is one cell ID or a list of them; paths are the cells of several robots' paths,
+    # each drawn in its own colour like the solution path.
+    explored_mask = _cell_mask(grid, explored) if show_explored else None
+    codes = np.full((grid.height, grid.width), EMPTY_COLOR, dtype=np.uint8)
+    codes[grid.cells == g.CARPET] = CARPET_COLOR
+    if solution is not None and show_explored:
+        codes[explored_mask] = EXPLORED_COLOR
+    if solution is not None and show_solution:
+        codes[_cell_mask(grid, solution)] = SOLUTION_COLOR
+    if show_solution:
+        for i, path in enumerate(paths):
+            codes[_cell_mask(grid, path)] = PATH_COLORS[i % len(PATH_COLORS)]
+    if show_explored:
+        codes[explored_mask & (grid.cells == g.DIRT)] = EXPLORED_DIRT_COLOR
+    if start is not None:
+        codes.flat[start] = START_COLOR
+    codes[grid.cells == g.WALL] = WALL_COLOR
+    return codes
+
+
+def downsample(codes, factor):
+    # Merge factor x factor blocks of cells into one, keeping the colour with the highest precedence
+    if factor == 1:
+        return codes
+    height, width = codes.shape
+    padded = np.full((-(-height // factor) * factor, -(-width // factor) * factor), EMPTY_COLOR, dtype=np.uint8)
+    padded[:height, :width] = codes
+    blocks = RANK[padded].reshape(padded.shape[0] // factor, factor, padded.shape[1] // factor, factor)
+    return PRECEDENCE[blocks.min(axis=(1, 3))]
+
+
+def to_image(codes, cell_size=30, cell_border=2):
+    # Upscale colour codes to pixels in one pass: every cell becomes a cell_size square
+    # filled from cell_border to cell_size - cell_border inclusive, on a black background
+    # The image keeps the colour codes as a palette image, one byte per pixel
+    height, width = codes.shape
+    pixels = np.empty((height, cell_size, width, cell_size), dtype=np.uint8)
+    pixels[...] = BORDER_COLOR
+    inner = slice(cell_border, cell_size - cell_border + 1) if cell_border else slice(None)
+    pixels[:, inner, :, inner] = codes[:, None, :, None]
+    image = Image.fromarray(pixels.reshape(height * cell_size, width * cell_size), "P")
+    image.putpalette(PALETTE.ravel().tolist(), rawmode="RGBA")
+    return image
+
+
+def render(grid, start, filename, solution=None, explored=(), show_solution=True, show_explored=False,
+           cell_size=30, cell_border=2, factor=1, paths=()):
+    # Render the map with its solution and explored overlays to an image file.
+    # With factor > 1 every factor x factor block of cells is drawn as one cell, which bounds
+    # the image size of very large maps.
+    codes = color_codes(grid, start, solution, explored, show_solution, show_explored, paths)
+    to_image(downsample(codes, factor), cell_size, cell_border).save(filename)
+
+
+def render_tiles(grid, start, directory, solution=None, explored=(), show_solution=True, show_explored=False,
+                 cell_size=4, cell_border=0, factor=1, tile_cells=1024, paths=()):
+    # Render the map as a set of tile images of at most tile_cells x tile_cells (downsampled) cells each,
+    # saved as directory/tile_<row>_<col>.png, so no single image has to hold the whole map.
+    # Returns the file names of the tiles.
+    codes = downsample(color_codes(grid, start, solution, explored, show_solution, show_explored, paths), factor)
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for top in range(0, codes.shape[0], tile_cells):
+        for left in range(0, codes.shape[1], tile_cells):
+            tile = codes[top:top + tile_cells, left:left + tile_cells]
+            filename = os.path.join(directory, "tile_%d_%d.png" % (top // tile_cells, left // tile_cells))
+            to_image(tile, cell_size, cell_border).save(filename)
+            filenames.append(filename)
+    return filenames
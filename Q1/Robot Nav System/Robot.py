@@ -1,55 +1,26 @@
 import sys
-import Node as n  # Importing the Node class for representing nodes in search algorithms
+import NodePool as npool  # Importing the NodePool that stores search nodes in typed arrays
 import PriorityQueueFrontier as pq  # Importing the PriorityQueueFrontier for managing nodes in A* search
-from PIL import Image, ImageDraw  # Importing PIL modules for image processing
+import DistanceField as df  # Importing the DistanceField for O(1) nearest-dirt lookups
+import Grid as g  # Importing the packed Grid used to store the environment
+import MapLoader as ml  # Importing the MapLoader that reads map files into a Grid in bulk
+import CoveragePlanner as cp  # Importing the CoveragePlanner for full-coverage cleaning tours
+import Renderer as rd  # Importing the Renderer that draws the environment with NumPy and PIL
+import SearchStats as ss  # Importing the optional counters and timers for the search
+import MapCache as mc  # Importing the cache of compiled, memory-mapped maps
 
 class Robot():
-    def __init__(self, filename):
-        # Read the environment from the file
-        with open(filename) as f:
-            contents = f.read()
-
-        # Split the contents into lines
-        contents = contents.splitlines()
-
-        # Determine height and width of the environment
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Initialize lists for walls and dirt locations
-        self.walls = []
-        self.dirt = []
-
-        # Parse each character in the file and create the environment grid
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        # Set start position
-                        self.start = (i, j)
-                        row.append("A")
-                    elif contents[i][j] == "#":
-                        # Add walls
-                        row.append("#")
-                    elif contents[i][j] == "X":
-                        # Add obstacles
-                        row.append("X")
-                    elif contents[i][j] == "+":
-                        # Add dirt locations
-                        row.append("+")
-                        self.dirt.append((i, j))
-                    elif contents[i][j] == " ":
-                        # Empty space
-                        row.append(" ")
-                    else:
-                        # Default to wall
-                        row.append("#")
-                except IndexError:
-                    # Handle incomplete rows
-                    row.append(" ")
-            # Add the row to the walls grid
-            self.walls.append(row)
+    def __init__(self, filename, cache_dir=None):
+        # Memory-map the environment file and pack it into a grid of cell classes with flat cell IDs.
+        # With a cache directory the map is compiled once and later runs load the compiled arrays instead.
+        self.artifact = mc.load(filename, cache_dir) if cache_dir is not None else None
+        self.grid = self.artifact.grid() if self.artifact is not None else ml.load_grid(filename)
+        self.height = self.grid.height
+        self.width = self.grid.width
+
+        # Start position and dirt locations as flat cell IDs
+        self.start = self.grid.start
+        self.dirt = self.grid.dirt
 
         # Initialize solution and total_cost attributes
         self.solution = None
@@ -57,21 +28,22 @@ class Robot():
 
     def print(self):
         # Print the environment grid with specific characters representing the robot, walls, dirt, and solution path
-        solution = self.solution[1] if self.solution is not None else None
+        solution = set(self.solution[1]) if self.solution is not None else None
         print()
-        for i, row in enumerate(self.walls):
+        for i, row in enumerate(self.grid.cells.tolist()):
             for j, col in enumerate(row):
-                if col == "#":
+                cell = self.grid.cell(i, j)
+                if col == g.WALL:
                     print("█", end="")  # Wall
-                elif (i, j) == self.start:
+                elif cell == self.start:
                     print("A", end="")  # Robot start position
-                elif col == "X":
+                elif col == g.CARPET:
                     print("X", end="")  # Obstacle
-                elif col == "+":
+                elif col == g.DIRT:
                     print("+", end="")  # Dirt
-                elif col == " ":
+                elif col == g.EMPTY:
                     print(" ", end="")  # Empty space
-                elif solution is not None and (i, j) in solution:
+                elif solution is not None and cell in solution:
                     print("*", end="")  # Solution path
                 else:
                     print(" ", end="")
@@ -79,124 +51,106 @@ class Robot():
         print()
 
     def heuristic(self, state):
-        # Calculate the Manhattan distance between the current state and the nearest dirt location
-        distances = [abs(state[0] - dirt[0]) + abs(state[1] - dirt[1]) for dirt in self.dirt]
-        return min(distances, default=0)
+        # Look up the Manhattan distance between the current state and the nearest remaining dirt location
+        return self.dirt_field.distance(state)
 
     def neighbors(self, state):
-        # Generate neighboring states/actions that the robot can take from the current state
-        row, col = state
-        candidates = [("up", (row - 1, col)), ("down", (row + 1, col)), ("left", (row, col - 1)), ("right", (row, col + 1))]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width:
-                if self.walls[r][c] != "#":
-                    cost = 1
-                    if (r, c) in self.dirt:
-                        cost = 3  # Increase cost for cleaning dirt
-                    elif self.walls[r][c] == "X":
-                        cost = 5  # Increase cost for obstacles
-                    result.append((action, (r, c), cost))
-        return result
-
-    def solve(self):
-        # Implement the A* search algorithm to find the optimal path
-        start_node = n.Node(state=self.start, parent=None, action=None, cost=0, f_cost=0)  # Create the start node
-        frontier = pq.PriorityQueueFrontier()  # Create the frontier using a priority queue
-        frontier.add(start_node)  # Add the start node to the frontier
-        self.explored = set()  # Initialize the set of explored states
+        # Generate neighboring states/actions that the robot can take from the current state,
+        # with the step cost (1 empty, 3 dirt, 5 obstacle) precomputed in the grid
+        return self.grid.neighbors(state)
+
+    def solve(self, stats=None):
+        # Implement the A* search algorithm to find the optimal path.
+        # stats is an optional SearchStats that counts and times the search; without one nothing is measured.
+        stats = stats if stats is not None else ss.DISABLED
+        with stats.phase("setup"):
+            nodes = npool.NodePool(self.height * self.width)  # Parent, cost and action of every reached state, indexed by cell ID
+            # Build the nearest-dirt field once, or copy the compiled one
+            if self.artifact is not None:
+                self.dirt_field = self.artifact.dirt_field()
+            else:
+                self.dirt_field = df.DistanceField(self.height, self.width, self.dirt)
+            # Step costs and heuristic are integers, so this picks a bucket queue
+            frontier = pq.make_frontier(g.STEP_COSTS, self.heuristic(self.start))
+        # The loop calls these through locals, which the stats wrap when they are given
+        add = stats.pushing(frontier.add, frontier)
+        remove = stats.popping(frontier.remove)
+        heuristic = stats.counted("heuristic_calls", self.heuristic, "heuristic")
+        neighbors = stats.counted("neighbor_calls", self.neighbors, "neighbors")
+        on_expand = stats.on_expand
+        add(self.start, 0)  # Add the start state to the frontier
+        closed = nodes.closed  # Closed flag of every state, indexed by cell ID
         self.num_explored = 0  # Initialize the number of states explored
         remaining_dirt = set(self.dirt)  # Initialize the set of remaining dirt locations
 
-        while True:
-            if frontier.empty():
-                # If the frontier is empty and no solution is found, raise an exception
-                raise Exception("no solution")
-
-            current_node = frontier.remove()  # Get the next node from the frontier
-            self.num_explored += 1  # Increment the number of states explored
-
-            if current_node.state in remaining_dirt:
-                # If the current node is on a dirt location, clean it
-                remaining_dirt.remove(current_node.state)
-                if not remaining_dirt:
-                    # If all dirt locations are cleaned, construct the solution path
-                    actions = []
-                    cells = []
-                    total_cost = 0
-                    while current_node.parent is not None:
-                        actions.append(current_node.action)
-                        cells.append(current_node.state)
-                        total_cost += current_node.cost
-                        current_node = current_node.parent
-                    actions.reverse()
-                    cells.reverse()
-                    self.solution = (actions, cells)
-                    self.total_cost = total_cost
-                    return
-
-            self.explored.add(current_node.state)  # Add the current node to the set of explored states
-
-            for action, state, cost in self.neighbors(current_node.state):
-                # Iterate over neighboring states
-                if not frontier.contains_state(state) and state not in self.explored:
-                    # If the state is neither in the frontier nor explored, add it to the frontier
-                    new_cost = current_node.cost + cost
-                    heuristic = self.heuristic(state)
-                    f_cost = new_cost + heuristic
-                    next_node = n.Node(state=state, parent=current_node, action=action, cost=new_cost, f_cost=f_cost)
-                    frontier.add(next_node)
-
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        # Generate an image representation of the environment
-        cell_size = 30
-        cell_border = 2
-
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
+        try:
+            with stats.phase("search"):
+                while True:
+                    if frontier.empty():
+                        # If the frontier is empty and no solution is found, raise an exception
+                        raise Exception("no solution")
+
+                    current = remove()  # Get the next state from the frontier
+                    self.num_explored += 1  # Increment the number of states explored
+                    if on_expand is not None:
+                        on_expand(current, nodes.cost[current])
+
+                    if current in remaining_dirt:
+                        # If the current state is on a dirt location, clean it
+                        remaining_dirt.remove(current)
+                        self.dirt_field.remove(current)  # Repair the field around the cleaned cell
+                        if not remaining_dirt:
+                            break  # All dirt locations are cleaned
+
+                    closed[current] = 1  # Mark the current state as explored
+                    current_cost = nodes.cost[current]
+
+                    for action, state, cost in neighbors(current):
+                        # Iterate over neighboring states
+                        if closed[state]:
+                            continue
+                        new_cost = current_cost + cost
+                        if not frontier.contains_state(state) or new_cost < nodes.cost[state]:
+                            # If the state is new or reached more cheaply, add it to the frontier or update its priority
+                            f_cost = new_cost + heuristic(state)
+                            nodes.set(state, current, action, new_cost)
+                            add(state, f_cost)
+        finally:
+            self.explored = nodes.closed_cells()  # Cell IDs of the explored states
+            stats.add("expansions", self.num_explored)
+            stats.add("stale_pops", frontier.stale_pops)
+
+        with stats.phase("reconstruct"):
+            # Construct the solution path from the pool arrays
+            actions, cells = nodes.path(current)
+            self.solution = (actions, cells)
+            self.total_cost = sum(nodes.cost[cell] for cell in cells)
+
+    def solve_coverage(self, max_exact=20):
+        # Plan a full-coverage cleaning tour: optimal for up to max_exact dirt cells, approximate above that
+        planner = cp.CoveragePlanner(self.grid, self.start, self.dirt, max_exact=max_exact)
+        order, total_cost = planner.plan()  # Order in which to clean the dirt and the cost of the tour
+        self.solution = planner.path(order)  # Stitch the shortest paths between the dirt cells together
+        self.total_cost = total_cost
+        self.explored = planner.explored_cells()  # Cells reached while computing the pairwise costs
+        self.num_explored = planner.num_explored  # Number of (position, remaining dirt) states expanded
+
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=30, factor=1):
+        # Generate an image representation of the environment; the cell colours are computed
+        # for the whole grid at once and handed to PIL as a single image
         solution = self.solution[1] if self.solution is not None else None
-        explored_dict = {state: index for index, state in enumerate(self.explored)}
-
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col == "#":
-                    fill = (40, 40, 40)  # Dark gray for walls
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)  # Red for start
-                elif show_explored and (i, j) in self.explored and self.walls[i][j] == "+":
-                    fill = (255, 165, 0)  # Orange for explored cells containing "+"
-                    draw.text((j * cell_size + 5, i * cell_size + 5), str(explored_dict[(i, j)]), fill="black")  # Add number to explored cells
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)  # Light yellow for solution path
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)  # Light red for explored but not in solution path
-                elif col == "X":
-                    fill = (128, 0, 128)  # Purple for obstacles
-                else:
-                    fill = (237, 240, 252)  # Default light gray for empty space
-
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)  # Save the generated image to a file
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python Robot.py h1.txt")  # Exit if the script is not called with the correct arguments
+        explored = getattr(self, "explored", ())  # Nothing has been explored before solve() runs
+        rd.render(self.grid, self.start, filename, solution, explored, show_solution, show_explored,
+                  cell_size=cell_size, factor=factor)  # Save the generated image to a file
 
-r = Robot(sys.argv[1])  # Create a Robot instance with the filename provided as a command-line argument
-r.solve()  # Solve the environment
-print("States Explored:", r.num_explored)  # Print the number of states explored
-print("Total Cost:", r.total_cost)  # Print the total cost of the solution
-r.output_image("maze.png", show_explored=True)  # Generate an image representing the environment
 
+if __name__ == "__main__":
+    # Only run the command line when executed directly, so other scripts can import Robot
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python Robot.py h1.txt")  # Exit if the script is not called with the correct arguments
 
+    r = Robot(sys.argv[1])  # Create a Robot instance with the filename provided as a command-line argument
+    r.solve()  # Solve the environment
+    print("States Explored:", r.num_explored)  # Print the number of states explored
+    print("Total Cost:", r.total_cost)  # Print the total cost of the solution
+    r.output_image("maze.png", show_explored=True)  # Generate an image representing the environment
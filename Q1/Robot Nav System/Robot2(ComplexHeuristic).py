@@ -1,69 +1,65 @@
 import sys
-import Node as n
+import numpy as np
+import NodePool as npool
 import PriorityQueueFrontier as pq
-from PIL import Image, ImageDraw
+import DistanceField as df
+import Grid as g
+import MapLoader as ml
+import Renderer as rd
+import SearchStats as ss
+import MapCache as mc
 
 
 class Robot():
-    def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
+    def __init__(self, filename, cache_dir=None):
         # Parses the file contents to identify walls (#),
         # start position (A), dirt locations (+), carpet (X), and empty spaces ().
         # Stores the maze dimensions (height and width).
-        # Initializes attributes like walls (2D list representing the maze),
+        # Initializes attributes like grid (packed cell classes of the maze),
         # dirt (list of dirt locations), start (starting position),
         # and solution (stores path and explored cells after solving).
-
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        self.walls = []
-        self.wall = []
-        self.dirt = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append("A")
-                    elif contents[i][j] == "#":
-                        row.append("#")
-                        self.wall.append((i, j))
-                    elif contents[i][j] == "X":
-                        row.append("X")
-                    elif contents[i][j] == "+":
-                        row.append("+")
-                        self.dirt.append((i, j))
-                    elif contents[i][j] == " ":
-                        row.append(" ")
-                    else:
-                        row.append("#")
-                except IndexError:
-                    row.append(" ")
-            self.walls.append(row)
+        # The file is memory-mapped and translated to cell classes in bulk, or, with a cache directory,
+        # compiled once and loaded from the compiled arrays together with the distance fields.
+
+        self.artifact = mc.load(filename, cache_dir) if cache_dir is not None else None
+        self.grid = self.artifact.grid() if self.artifact is not None else ml.load_grid(filename)
+        self.height = self.grid.height
+        self.width = self.grid.width
+
+        # Positions are flat cell IDs (row * width + col) into the packed grid
+        self.start = self.grid.start
+        self.dirt = self.grid.dirt
+
+        # The walls never change, so the clearance field is built once per map. Every cell that parses as
+        # a wall counts as an obstacle for the clearance heuristic, including unknown map characters;
+        # the old text parser blocked those too but measured clearance to "#" only.
+        # The wall cells are not kept: the field and the grid already hold everything the search needs.
+        if self.artifact is not None:
+            self.wall_field = self.artifact.wall_field()
+        else:
+            walls = np.flatnonzero(self.grid.cells == g.WALL).tolist()
+            self.wall_field = df.DistanceField(self.height, self.width, walls)
 
         self.solution = None
         self.total_cost = 0
 
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
+        solution = set(self.solution[1]) if self.solution is not None else None
         print()
-        for i, row in enumerate(self.walls):
+        for i, row in enumerate(self.grid.cells.tolist()):
             for j, col in enumerate(row):
-                if col == "#":
+                cell = self.grid.cell(i, j)
+                if col == g.WALL:
                     print("█", end="")
-                elif (i, j) == self.start:
+                elif cell == self.start:
                     print("A", end="")
-                elif col == "X":
+                elif col == g.CARPET:
                     print("X", end="")
-                elif col == "+":
+                elif col == g.DIRT:
                     print("+", end="")
-                elif col == " ":
+                elif col == g.EMPTY:
                     print(" ", end="")
-                elif solution is not None and (i, j) in solution:
+                elif solution is not None and cell in solution:
                     print("*", end="")
                 else:
                     print(" ", end="")
@@ -77,7 +73,7 @@ class Robot():
         Calculates a heuristic score for a given robot state.
 
         Args:
-            state: A tuple representing the robot's current coordinates (x, y).
+            state: The flat cell ID (row * width + col) of the robot's current position.
 
         Returns:
             A float representing the heuristic score. Higher score indicates less desirable location.
@@ -88,26 +84,24 @@ class Robot():
             Calculates the squared distance to the nearest obstacle.
 
             Args:
-              state: A tuple representing the robot's current coordinates (x, y).
+              state: The flat cell ID (row * width + col) of the robot's current position.
 
             Distance to nearest obstacle: It calculates the squared distance to the closest wall using adjusted_distance_to_obstacle.
             Squaring the distance emphasizes avoiding obstacles more significantly.
             """
-            distances = [abs(state[0] - obstacle[0]) + abs(state[1] - obstacle[1]) for obstacle in self.wall]
-            return min(distances, default=0) ** 2
+            return self.wall_field.distance(state) ** 2
 
         def distance_to_dirt(state):
             """
             Calculates the Manhattan distance to the nearest dirt location.
 
             Args:
-              state: A tuple representing the robot's current coordinates (x, y).
+              state: The flat cell ID (row * width + col) of the robot's current position.
 
             Distance to nearest dirt: It calculates the Manhattan distance to the closest dirt location using distance_to_dirt.
 
             """
-            distances = [abs(state[0] - dirt[0]) + abs(state[1] - dirt[1]) for dirt in self.dirt]
-            return min(distances, default=0)
+            return self.dirt_field.distance(state)
 
         # These weights control the relative importance of avoiding obstacles and reaching dirt locations.
         # By default, obstacles have a higher weight (0.7) to prioritize staying clear of walls.
@@ -121,115 +115,93 @@ class Robot():
         return obstacle_weight * adjusted_distance_to_obstacle(state) + dirt_weight * distance_to_dirt(state)
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [("up", (row - 1, col)), ("down", (row + 1, col)), ("left", (row, col - 1)),
-                      ("right", (row, col + 1))]
         # Given the current state (robot's position),
         # this method identifies all valid neighboring locations (up, down, left, right)
         # that are within the maze boundaries and not blocked by walls.
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width:
-                if self.walls[r][c] != "#":
-                    cost = 1
-                    # 1 for moving to an empty space.
-                    if (r, c) in self.dirt:
-                        cost = 3  # Increase cost for cleaning dirt
-                    elif self.walls[r][c] == "X":
-                        cost = 5  # Increase cost for obstacles
-                    result.append((action, (r, c), cost))
-        return result
-
-    def solve(self):
-        start_node = n.Node(state=self.start, parent=None, action=None, cost=0, f_cost=0)
-        frontier = pq.PriorityQueueFrontier()
-        frontier.add(start_node)
-        self.explored = set()
+        # Step costs come precomputed from the grid:
+        # 1 for moving to an empty space, 3 for cleaning dirt, 5 for carpet.
+        return self.grid.neighbors(state)
+
+    def solve(self, stats=None):
+        # stats is an optional SearchStats; its hooks wrap the frontier, heuristic and neighbour calls
+        # before the loop starts, so a search without stats runs exactly as before
+        stats = stats if stats is not None else ss.DISABLED
+        with stats.phase("setup"):
+            # Search nodes live in typed arrays indexed by cell ID rather than in Node objects
+            nodes = npool.NodePool(self.height * self.width)
+            if self.artifact is not None:
+                self.dirt_field = self.artifact.dirt_field()
+            else:
+                self.dirt_field = df.DistanceField(self.height, self.width, self.dirt)
+            # The complex heuristic is fractional, so this picks an indexed heap with decrease-key
+            frontier = pq.make_frontier(g.STEP_COSTS, self.complex_heuristic(self.start))
+        add = stats.pushing(frontier.add, frontier)
+        remove = stats.popping(frontier.remove)
+        complex_heuristic = stats.counted("heuristic_calls", self.complex_heuristic, "heuristic")
+        neighbors = stats.counted("neighbor_calls", self.neighbors, "neighbors")
+        on_expand = stats.on_expand
+        add(self.start, 0)
+        closed = nodes.closed
         self.num_explored = 0
         remaining_dirt = set(self.dirt)
 
-        while True:
-            if frontier.empty():
-                raise Exception("no solution")
-
-            current_node = frontier.remove()
-            self.num_explored += 1
-
-            if current_node.state in remaining_dirt:
-                # If the current state is a dirty location, it's marked as cleaned in remaining_dirt
-                remaining_dirt.remove(current_node.state)
-                if not remaining_dirt:
-                    actions = []
-                    cells = []
-                    total_cost = 0
-                    while current_node.parent is not None:
-                        actions.append(current_node.action)
-                        cells.append(current_node.state)
-                        total_cost += current_node.cost
-                        current_node = current_node.parent
-                    actions.reverse()
-                    cells.reverse()
-                    self.solution = (actions, cells)
-                    self.total_cost = total_cost
-                    return
-
-            self.explored.add(current_node.state)
-
-            for action, state, cost in self.neighbors(current_node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    new_cost = current_node.cost + cost
-                    heuristic = self.complex_heuristic(state)
-                    f_cost = new_cost + heuristic
-                    next_node = n.Node(state=state, parent=current_node, action=action, cost=new_cost, f_cost=f_cost)
-                    frontier.add(next_node)
-
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        cell_size = 30
-        cell_border = 2
-
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
+        try:
+            with stats.phase("search"):
+                while True:
+                    if frontier.empty():
+                        raise Exception("no solution")
+
+                    current = remove()
+                    self.num_explored += 1
+                    if on_expand is not None:
+                        on_expand(current, nodes.cost[current])
+
+                    if current in remaining_dirt:
+                        # If the current state is a dirty location, it's marked as cleaned in remaining_dirt
+                        remaining_dirt.remove(current)
+                        # The nearest-dirt field is repaired around the cleaned cell
+                        self.dirt_field.remove(current)
+                        if not remaining_dirt:
+                            break
+
+                    closed[current] = 1
+                    current_cost = nodes.cost[current]
+
+                    for action, state, cost in neighbors(current):
+                        if closed[state]:
+                            continue
+                        new_cost = current_cost + cost
+                        # Cheaper paths to a state already in the frontier replace the queued node
+                        if not frontier.contains_state(state) or new_cost < nodes.cost[state]:
+                            heuristic = complex_heuristic(state)
+                            f_cost = new_cost + heuristic
+                            nodes.set(state, current, action, new_cost)
+                            add(state, f_cost)
+        finally:
+            self.explored = nodes.closed_cells()
+            stats.add("expansions", self.num_explored)
+            stats.add("stale_pops", frontier.stale_pops)
+
+        with stats.phase("reconstruct"):
+            actions, cells = nodes.path(current)
+            self.solution = (actions, cells)
+            self.total_cost = sum(nodes.cost[cell] for cell in cells)
+
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=30, factor=1):
+        # Colours for every cell are computed with NumPy and saved as one image;
+        # factor > 1 merges factor x factor blocks of cells for very large maps
         solution = self.solution[1] if self.solution is not None else None
-        explored_dict = {state: index for index, state in enumerate(self.explored)}
-
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col == "#":
-                    fill = (40, 40, 40)  # Dark gray for walls
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)  # Red for start
-                elif show_explored and (i, j) in self.explored and self.walls[i][j] == "+":
-                    fill = (255, 165, 0)  # Orange for explored cells containing "+"
-                    draw.text((j * cell_size + 5, i * cell_size + 5), str(explored_dict[(i, j)]),
-                              fill="black")  # Add number to explored cells
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)  # Light yellow for solution path
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)  # Light red for explored but not in solution path
-                elif col == "X":
-                    fill = (128, 0, 128)  # Purple for carpet
-                else:
-                    fill = (237, 240, 252)  # Default light gray for empty space
-
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
+        explored = getattr(self, "explored", ())
+        rd.render(self.grid, self.start, filename, solution, explored, show_solution, show_explored,
+                  cell_size=cell_size, factor=factor)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python maze.py maze.txt")
 
-r = Robot(sys.argv[1])
-r.solve()
-print("States Explored:", r.num_explored)
-print("Total Cost:", r.total_cost)  # Print total cost
-r.output_image("maze(CH).png", show_explored=True)
+    r = Robot(sys.argv[1])
+    r.solve()
+    print("States Explored:", r.num_explored)
+    print("Total Cost:", r.total_cost)  # Print total cost
+    r.output_image("maze(CH).png", show_explored=True)
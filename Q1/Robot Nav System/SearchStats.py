@@ -0,0 +1,135 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Instrumentation for the A* searches. A search given a SearchStats counts its frontier pushes and pops,
+# stale pops, heuristic and neighbour calls and the largest frontier size, and times its phases.
+# The hooks work by wrapping the callables the search loop uses (frontier add/remove, heuristic,
+# neighbors) before the loop starts, so a search without stats runs the bare callables and pays nothing
+# inside the loop except one check for the expansion callback.
+#
+# Two kinds of timers are kept, both in seconds:
+#   phases  - "setup", "search" and "reconstruct", timed once per solve and kept as trace events too
+#   calls   - "heuristic", "neighbors" and "frontier", summed over every call (only with timers=True)
+# The calls happen inside the "search" phase, so their time is part of it.
+
+COUNTERS = ("expansions", "pushes", "pops", "stale_pops", "heuristic_calls", "neighbor_calls", "max_frontier")
+
+
+class SearchStats():
+    def __init__(self, timers=True, on_expand=None):
+        # timers=False keeps only the counters, which skips the clock reads around every call.
+        # on_expand(state, cost) is called for every expanded state with its path cost.
+        self.timers = timers
+        self.on_expand = on_expand
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = {}              # Total time of every phase
+        self.calls = {}               # Total time spent in every kind of call
+        self.events = []              # (name, start, duration) of every timed phase, start from origin
+        self.origin = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        # Time a block of a search as one phase
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - begin
+            self.phases[name] = self.phases.get(name, 0.0) + duration
+            self.events.append((name, begin - self.origin, duration))
+
+    def counted(self, counter, function, timer=None):
+        # Wrap a callable so every call increments a counter and, with timers on, adds its time to a timer
+        counters = self.counters
+        if not (self.timers and timer):
+            def wrapper(*args):
+                counters[counter] += 1
+                return function(*args)
+            return wrapper
+        calls = self.calls
+        calls.setdefault(timer, 0.0)
+        clock = time.perf_counter
+
+        def timed(*args):
+            counters[counter] += 1
+            begin = clock()
+            result = function(*args)
+            calls[timer] += clock() - begin
+            return result
+        return timed
+
+    def pushing(self, function, frontier):
+        # Wrap the function that adds to a frontier: counts pushes, tracks the largest len(frontier)
+        # and times the call as frontier work
+        push = self.counted("pushes", function, "frontier")
+        counters = self.counters
+
+        def wrapper(*args):
+            push(*args)
+            if len(frontier) > counters["max_frontier"]:
+                counters["max_frontier"] = len(frontier)
+        return wrapper
+
+    def popping(self, function):
+        # Wrap the function that takes the next state off a frontier
+        return self.counted("pops", function, "frontier")
+
+    def add(self, counter, value):
+        # Add to a counter the search keeps itself, such as the frontier's stale pops
+        self.counters[counter] += value
+
+    def as_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "phases": dict(self.phases),
+            "calls": dict(self.calls),
+        }
+
+    def to_json(self, filename=None):
+        # The counters and timers as JSON text, also written to filename when one is given
+        text = json.dumps(self.as_dict(), indent=2)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(text)
+        return text
+
+    def chrome_trace(self):
+        # Trace in the Chrome trace event format (chrome://tracing, Perfetto): one complete event per
+        # timed phase, then the counters and summed call times at the end of the last phase.
+        # Times in the format are microseconds.
+        events = [{"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": 0, "tid": 0}
+                  for name, start, duration in self.events]
+        end = max((start + duration for name, start, duration in self.events), default=0.0) * 1e6
+        events.append({"name": "counters", "ph": "C", "ts": end, "pid": 0, "tid": 0, "args": dict(self.counters)})
+        if self.calls:
+            events.append({"name": "call time (ms)", "ph": "C", "ts": end, "pid": 0, "tid": 0,
+                           "args": {name: seconds * 1e3 for name, seconds in self.calls.items()}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _NoStats():
+    # Stand-in used when a search is run without stats: every hook hands back what it was given
+    on_expand = None
+
+    def phase(self, name):
+        return nullcontext()
+
+    def counted(self, counter, function, timer=None):
+        return function
+
+    def pushing(self, function, frontier):
+        return function
+
+    def popping(self, function):
+        return function
+
+    def add(self, counter, value):
+        pass
+
+
+DISABLED = _NoStats()
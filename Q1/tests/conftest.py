@@ -0,0 +1,7 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+Q1 = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(Q1, "Robot Nav System"))  # The robot scripts import each other by bare module name
+sys.path.insert(0, Q1)
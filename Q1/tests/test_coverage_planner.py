@@ -0,0 +1,100 @@
+import heapq
+import itertools
+
+import pytest
+
+import CoveragePlanner as cp
+import Grid as g
+import MapGenerator as mg
+
+
+def random_grid(seed, dirt_count):
+    lines = mg.generate_map(10 + seed % 5, 12 + seed % 4, 0.15, 0.15, dirt_count=dirt_count, seed=seed)
+    return g.Grid.from_lines(lines)
+
+
+def dijkstra(grid, source):
+    # Plain Dijkstra over Grid.neighbors, independent of the planner's sweeps
+    dist = {source: 0}
+    heap = [(0, source)]
+    while heap:
+        cost, cell = heapq.heappop(heap)
+        if cost > dist[cell]:
+            continue
+        for _, neighbor, step in grid.neighbors(cell):
+            if cost + step < dist.get(neighbor, cost + step + 1):
+                dist[neighbor] = cost + step
+                heapq.heappush(heap, (cost + step, neighbor))
+    return dist
+
+
+def brute_force(grid):
+    # Cheapest order of cleaning every dirt cell, trying all of them
+    points = [grid.start] + grid.dirt
+    dist = {point: dijkstra(grid, point) for point in points}
+    return min(sum(dist[a][b] for a, b in zip((grid.start,) + order, order))
+               for order in itertools.permutations(grid.dirt))
+
+
+def assert_valid_tour(grid, planner, order, cost):
+    # The stitched path is connected, costs what the plan says and cleans every dirt cell
+    actions, cells = planner.path(order)
+    assert sorted(order) == sorted(grid.dirt)
+    assert len(actions) == len(cells)
+    previous = grid.start
+    for cell in cells:
+        assert abs(cell - previous) in (1, grid.width)
+        previous = cell
+    assert sum(grid.cost(cell) for cell in cells) == cost
+    assert set(grid.dirt) <= set(cells)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_exact_tour_matches_brute_force(seed):
+    grid = random_grid(seed, 1 + seed % 6)
+    planner = cp.CoveragePlanner(grid, grid.start, grid.dirt)
+    order, cost = planner.plan()
+
+    assert cost == brute_force(grid)
+    assert_valid_tour(grid, planner, order, cost)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cost_matrix_matches_dijkstra(seed):
+    grid = random_grid(seed, 5)
+    points = [grid.start] + grid.dirt
+    matrix = cp.CoveragePlanner(grid, grid.start, grid.dirt).cost_matrix()
+
+    for i, source in enumerate(points):
+        dist = dijkstra(grid, source)
+        assert matrix[i] == [dist[target] for target in points]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_approximate_tour_is_valid(seed):
+    # max_exact=0 takes the candidate-list fallback even on small maps
+    grid = random_grid(seed, 6)
+    planner = cp.CoveragePlanner(grid, grid.start, grid.dirt, max_exact=0)
+    order, cost = planner.plan()
+
+    assert cost >= brute_force(grid)
+    assert_valid_tour(grid, planner, order, cost)
+
+
+def test_unreachable_dirt_has_no_solution():
+    grid = g.Grid.from_lines(["A #+", "  # "])
+    with pytest.raises(Exception, match="no solution"):
+        cp.CoveragePlanner(grid, grid.start, grid.dirt).plan()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_short_candidate_lists_still_give_a_valid_tour(monkeypatch, seed):
+    # With fewer candidates than points, costs outside the lists are searched when the tour needs them
+    monkeypatch.setattr(cp, "CANDIDATES", 2)
+    grid = random_grid(seed, 12)
+    planner = cp.CoveragePlanner(grid, grid.start, grid.dirt, max_exact=0)
+    order, cost = planner.plan()
+
+    exact = cp.CoveragePlanner(grid, grid.start, grid.dirt, max_exact=12).plan()[1]
+    assert cost >= exact
+    assert_valid_tour(grid, planner, order, cost)
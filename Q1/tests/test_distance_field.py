@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+import DistanceField as df
+
+
+def manhattan(width, cell, sources):
+    # Distance from a cell to the nearest source, trying every source
+    r, c = divmod(cell, width)
+    return min(abs(r - sr) + abs(c - sc) for sr, sc in (divmod(source, width) for source in sources))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_remove_matches_a_fresh_field(seed):
+    # After every removal each cell is as far from its source as from the nearest remaining one,
+    # and the field agrees with one built from the remaining sources alone
+    rng = random.Random(seed)
+    height, width = rng.randint(1, 12), rng.randint(1, 12)
+    sources = rng.sample(range(height * width), rng.randint(1, min(15, height * width)))
+    field = df.DistanceField(height, width, sources + sources[:2])  # Repeated sources count once
+    assert field.count == len(sources)
+
+    remaining = list(sources)
+    rng.shuffle(remaining)
+    while remaining:
+        removed = remaining.pop()
+        field.remove(removed)
+        field.remove(removed)  # Removing a cell that is no source changes nothing
+        assert field.count == len(remaining)
+        if not remaining:
+            break
+        fresh = df.DistanceField(height, width, remaining)
+        assert list(field.dist) == list(fresh.dist)
+        for cell in range(height * width):
+            assert field.dist[cell] == manhattan(width, cell, remaining)
+            assert field.label[cell] in remaining
+            assert field.distance(cell) == manhattan(width, cell, [field.label[cell]])
+
+    assert all(field.distance(cell) == 0 for cell in range(height * width))
+
+
+def test_from_arrays_copies_unless_asked_not_to():
+    field = df.DistanceField(3, 4, [0, 11])
+    copy = df.DistanceField.from_arrays(3, 4, field.dist, field.label, field.count)
+    copy.remove(11)
+    assert copy.count == 1 and field.count == 2
+    assert field.distance(10) == 1 and copy.distance(10) == 4
+
+    shared = df.DistanceField.from_arrays(3, 4, field.dist, field.label, field.count, copy=False)
+    assert [shared.distance(cell) for cell in range(12)] == [field.distance(cell) for cell in range(12)]
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+import NavSystem_Manhtn as nav
+from DStarLite import DStarLite
+
+
+def test_obstacles_outside_the_grid_are_ignored():
+    grid = nav.DynamicGridWorld(5, 5, [])
+    planner = DStarLite(grid, (0, 0), (4, 4))
+    assert len(planner.plan()) == 9
+
+    for cell in ((4, 5), (5, 0), (-1, 2)):
+        assert grid.add_obstacle(*cell)
+    assert grid.version == 0
+    path = planner.plan()
+    assert len(path) == 9
+    assert all(0 <= x < 5 and 0 <= y < 5 for x, y in planner.rhs)
+
+    assert grid.remove_obstacle(5, 0)
+    assert planner.plan() == path
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_replanning_matches_a_star(seed):
+    # After every batch of obstacle changes the repaired path is as short as a fresh A* search
+    rng = random.Random(seed)
+    width, height = rng.randint(4, 12), rng.randint(4, 12)
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    start, goal = rng.sample(cells, 2)
+    free = [cell for cell in cells if cell not in (start, goal)]
+    grid = nav.DynamicGridWorld(width, height, rng.sample(free, len(free) // 5))
+    planner = DStarLite(grid, start, goal)
+
+    for _ in range(6):
+        path = planner.plan()
+        expected = nav.a_star(grid, start, goal)
+        if expected is None:
+            assert path is None
+        else:
+            assert path[0] == start and path[-1] == goal and len(path) == len(expected)
+        for cell in rng.sample(free, 3):
+            if cell in grid.obstacles:
+                grid.remove_obstacle(*cell)
+            else:
+                grid.add_obstacle(*cell)
@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+import PriorityQueueFrontier as pq
+
+
+@pytest.mark.parametrize("frontier_class", [pq.BucketQueueFrontier, pq.IndexedHeapFrontier])
+@pytest.mark.parametrize("seed", range(20))
+def test_pops_match_a_brute_force_minimum(frontier_class, seed):
+    # Random adds, priority changes and pops against a dict searched for its minimum on every pop
+    rng = random.Random(seed)
+    frontier = frontier_class()
+    queued = {}   # State -> priority
+    for _ in range(2000):
+        if queued and rng.random() < 0.35:
+            lowest = min(queued.values())
+            assert queued.pop(frontier.remove()) == lowest
+        else:
+            state, priority = rng.randrange(200), rng.randrange(60)
+            frontier.add(state, priority)
+            queued[state] = priority
+        assert len(frontier) == len(queued)
+        assert all(frontier.priority(state) == priority for state, priority in queued.items())
+    while queued:
+        lowest = min(queued.values())
+        assert queued.pop(frontier.remove()) == lowest
+    assert frontier.empty()
+    with pytest.raises(Exception):
+        frontier.remove()
+
+
+def test_heap_breaks_ties_by_insertion_order():
+    frontier = pq.IndexedHeapFrontier()
+    for state in (3, 1, 2, 0):
+        frontier.add(state, 1.5)
+    frontier.add(4, 2.5)
+    frontier.add(4, 1.5)  # Moved down to the tie, after every other state
+    assert [frontier.remove() for _ in range(5)] == [3, 1, 2, 0, 4]
+
+
+def test_bucket_queue_rejects_fractional_priorities():
+    frontier = pq.BucketQueueFrontier()
+    with pytest.raises(TypeError):
+        frontier.add(0, 1.5)
+    assert frontier.empty()
+
+
+def test_frontier_follows_the_cost_model():
+    integer_costs = np.array([1, 0, 5], dtype=np.uint8)
+    assert isinstance(pq.make_frontier(integer_costs, 3), pq.BucketQueueFrontier)
+    assert isinstance(pq.make_frontier(integer_costs, 3.0), pq.IndexedHeapFrontier)
+    assert isinstance(pq.make_frontier(integer_costs.astype(np.float64), 3), pq.IndexedHeapFrontier)
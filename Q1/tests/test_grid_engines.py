@@ -0,0 +1,56 @@
+import random
+from collections import deque
+
+import pytest
+
+import NavSystem_Manhtn as nav
+
+ENGINES = ("astar", "jps", "bidirectional")
+
+
+def random_world(seed):
+    rng = random.Random(seed)
+    width, height = rng.randint(2, 14), rng.randint(2, 14)
+    density = rng.choice((0.0, 0.1, 0.25, 0.4))
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    start, goal = rng.sample(cells, 2)
+    obstacles = [cell for cell in cells if cell not in (start, goal) and rng.random() < density]
+    return nav.GridWorld(width, height, obstacles), start, goal
+
+
+def bfs_length(grid, start, goal):
+    # Number of steps of a shortest path, or None if the goal cannot be reached
+    steps = {start: 0}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            return steps[cell]
+        for neighbor in grid.get_neighbors(*cell):
+            if neighbor not in steps:
+                steps[neighbor] = steps[cell] + 1
+                queue.append(neighbor)
+    return None
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("seed", range(150))
+def test_engines_find_shortest_paths(engine, seed):
+    grid, start, goal = random_world(seed)
+    path = nav.a_star(grid, start, goal, engine=engine)
+    expected = bfs_length(grid, start, goal)
+
+    if expected is None:
+        assert path is None
+        return
+    assert path[0] == start and path[-1] == goal
+    assert len(path) - 1 == expected
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert abs(x - nx) + abs(y - ny) == 1
+        assert grid.is_valid_move(nx, ny)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unreachable_goal_returns_none(engine):
+    grid = nav.GridWorld(5, 5, [(1, 0), (0, 1)])
+    assert nav.a_star(grid, (0, 0), (4, 4), engine=engine) is None
@@ -0,0 +1,89 @@
+import random
+from collections import deque
+
+import pytest
+
+import NavSystem_Manhtn as nav
+from HierarchicalPathfinder import HierarchicalPathfinder
+
+
+def bfs_length(grid, start, goal):
+    # Number of steps on a shortest path, or None if the goal cannot be reached
+    steps = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return steps[goal]
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if cell not in steps and grid.is_valid_move(*cell):
+                steps[cell] = steps[(x, y)] + 1
+                queue.append(cell)
+    return None
+
+
+def assert_valid_path(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    assert all(grid.is_valid_move(*cell) for cell in path)
+    assert all(abs(ax - bx) + abs(ay - by) == 1 for (ax, ay), (bx, by) in zip(path, path[1:]))
+
+
+def random_world(rng, world_class=nav.GridWorld):
+    width, height = rng.randint(5, 30), rng.randint(5, 30)
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    return world_class(width, height, rng.sample(cells, len(cells) // 4))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_paths_match_breadth_first_search(seed):
+    # Hierarchical paths are valid and never shorter than a shortest path; refined ones are shortest paths
+    rng = random.Random(seed)
+    grid = random_world(rng)
+    finder = HierarchicalPathfinder(grid, cluster_size=rng.randint(3, 8))
+    free = [(x, y) for x in range(grid.width) for y in range(grid.height) if grid.is_valid_move(x, y)]
+    for _ in range(20):
+        start, goal = rng.choice(free), rng.choice(free)
+        expected = bfs_length(grid, start, goal)
+        path = finder.find_path(start, goal)
+        exact = finder.find_path(start, goal, refine=True)
+        if expected is None:
+            assert path is None and exact is None
+            continue
+        assert_valid_path(grid, path, start, goal)
+        assert_valid_path(grid, exact, start, goal)
+        assert len(path) - 1 >= expected
+        assert len(exact) - 1 == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_obstacle_changes_invalidate_cached_paths(seed):
+    # A cached answer is reused until an obstacle changes; then the next query sees the new map
+    rng = random.Random(seed)
+    grid = random_world(rng, nav.DynamicGridWorld)
+    finder = HierarchicalPathfinder(grid, cluster_size=rng.randint(3, 8))
+    free = [(x, y) for x in range(grid.width) for y in range(grid.height) if grid.is_valid_move(x, y)]
+    start, goal = rng.sample(free, 2)
+
+    path = finder.find_path(start, goal, refine=True)
+    assert finder.find_path(start, goal, refine=True) == path
+    assert (finder.hits, finder.misses) == (1, 1)
+    if path is None or len(path) < 3:
+        return
+
+    blocked = path[len(path) // 2]
+    grid.add_obstacle(*blocked)
+    assert not finder.cache
+    detour = finder.find_path(start, goal, refine=True)
+    rough = finder.find_path(start, goal)
+    assert finder.misses == 3
+    expected = bfs_length(grid, start, goal)
+    if expected is None:
+        assert detour is None and rough is None
+    else:
+        assert_valid_path(grid, detour, start, goal)
+        assert_valid_path(grid, rough, start, goal)
+        assert len(detour) - 1 == expected
+
+    grid.remove_obstacle(*blocked)
+    assert len(finder.find_path(start, goal, refine=True)) == len(path)
+    assert finder.misses == 4
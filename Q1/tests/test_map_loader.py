@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+import Grid as g
+import MapLoader as ml
+
+CHARACTERS = " #XA+?\t"  # Every map character, plus two that parse as walls
+LINE_BREAKS = ["\n", "\r\n", "\r", "\x0b", "\x0c", "\x1c"]
+
+
+def text_grid(filename):
+    # The grid the text parser builds from a map file
+    with open(filename) as f:
+        return g.Grid.from_lines(f.read().splitlines())
+
+
+def assert_same_grid(loaded, parsed):
+    assert (loaded.height, loaded.width) == (parsed.height, parsed.width)
+    assert loaded.cells.tolist() == parsed.cells.tolist()
+    assert loaded.start == parsed.start
+    assert loaded.dirt == parsed.dirt
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_text_parser_on_fuzzed_maps(tmp_path, seed):
+    rng = random.Random(seed)
+    width = rng.randint(1, 12)
+    rows = []
+    for _ in range(rng.randint(1, 10)):
+        # Mostly rectangular maps, which take the strided path, and some ragged ones
+        length = width if rng.random() < 0.6 else rng.randint(0, width)
+        rows.append("".join(rng.choice(CHARACTERS) for _ in range(length)))
+    if not any(rows):
+        rows[0] = "#"
+    breaks = [rng.choice(LINE_BREAKS) if rng.random() < 0.3 else "\n" for _ in rows]
+    text = "".join(row + line_break for row, line_break in zip(rows, breaks))
+    if rng.random() < 0.5:
+        text = text[:-len(breaks[-1])]  # No line break after the last row
+    path = tmp_path / "map.txt"
+    path.write_bytes(text.encode("ascii"))
+
+    assert_same_grid(ml.load_grid(str(path)), text_grid(str(path)))
+
+
+def test_non_ascii_maps_fall_back_to_the_text_parser(tmp_path):
+    path = tmp_path / "map.txt"
+    path.write_bytes("#é#+\n#A  #\n".encode("utf-8"))
+
+    assert_same_grid(ml.load_grid(str(path)), text_grid(str(path)))
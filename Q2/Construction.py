@@ -0,0 +1,112 @@
+import numpy as np
+
+import SpatialIndex as si  # Grid index for nearest-point queries
+
+# Tour construction heuristics for points in the plane. Each returns a tour as a list of point
+# indices, built without an n x n distance matrix, as a start for hill climbing or local search.
+
+HILBERT_ORDER = 16  # Bits per axis of the Hilbert curve the points are snapped to
+
+
+def space_filling_curve_tour(coords):
+    # Visit the points in the order of a Hilbert curve through the bounding square: O(n log n) and
+    # the cheapest start, though on uniform points about 40% longer than a good tour
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if not len(coords):
+        return []
+    low = coords.min(axis=0)
+    extent = max(float((coords.max(axis=0) - low).max()), 1e-12)
+    scale = (1 << HILBERT_ORDER) - 1
+    x = np.round((coords[:, 0] - low[0]) / extent * scale).astype(np.int64)
+    y = np.round((coords[:, 1] - low[1]) / extent * scale).astype(np.int64)
+    # Classic xy -> d conversion, run on all points at once one bit level at a time
+    d = np.zeros(len(coords), dtype=np.int64)
+    s = 1 << (HILBERT_ORDER - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve inside it has the standard orientation
+        flip = ~ry & rx
+        x = np.where(flip, scale - x, x)
+        y = np.where(flip, scale - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return np.argsort(d, kind="stable").tolist()
+
+
+def nearest_neighbor_tour(coords, start=0, index=None):
+    # Start at a point and always go on to the nearest point not yet visited
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if not len(coords):
+        return []
+    index = index if index is not None else si.GridIndex(coords)
+    tour = [start]
+    index.remove(start)
+    xs, ys = index.xs, index.ys
+    while True:
+        point = index.nearest(xs[tour[-1]], ys[tour[-1]])
+        if point is None:
+            return tour
+        index.remove(point)
+        tour.append(point)
+
+
+def greedy_edge_tour(coords, k=10):
+    # Greedy matching: take candidate edges (k nearest neighbours) from the shortest up whenever both ends
+    # still have a free degree and the edge closes no cycle, then join the resulting paths end to end,
+    # always to the nearest free end of another path
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    if n < 3:
+        return list(range(n))
+    neighbors = si.GridIndex(coords, per_cell=k).knn(k)
+    a = np.repeat(np.arange(n), [len(row) for row in neighbors])
+    b = np.fromiter((other for row in neighbors for other in row), dtype=np.int64, count=len(a))
+    keep = a < b
+    a, b = a[keep], b[keep]
+    order = np.argsort(np.hypot(*(coords[a] - coords[b]).T), kind="stable")
+
+    degree = [0] * n
+    links = [[] for _ in range(n)]
+    root = list(range(n))
+
+    def find(point):
+        while root[point] != point:
+            root[point] = root[root[point]]
+            point = root[point]
+        return point
+
+    for u, v in zip(a[order].tolist(), b[order].tolist()):
+        if degree[u] < 2 and degree[v] < 2:
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                root[ru] = rv
+                degree[u] += 1
+                degree[v] += 1
+                links[u].append(v)
+                links[v].append(u)
+
+    # Join the paths: walk one to its other end, then jump to the nearest free end of another path.
+    # A point left with no edges is a path on its own, whose two ends are the same point.
+    ends = [point for point in range(n) if degree[point] < 2]
+    slot = {point: i for i, point in enumerate(ends)}
+    index = si.GridIndex(coords[ends])
+    tour = []
+    start = ends[0]
+    while True:
+        index.remove(slot[start])
+        previous, point = None, start
+        while True:
+            tour.append(point)
+            following = [other for other in links[point] if other != previous]
+            if not following:
+                break
+            previous, point = point, following[0]
+        if point != start:
+            index.remove(slot[point])
+        nearest = index.nearest(coords[point, 0], coords[point, 1])
+        if nearest is None:
+            return tour
+        start = ends[nearest]
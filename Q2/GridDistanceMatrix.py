@@ -0,0 +1,153 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+# Builds the site-to-site cost matrix TSPSolver needs from a floor grid, with one shortest-path
+# sweep per source site instead of one a_star call per pair of sites.
+# A grid is a (height, width) array of step costs: entering a cell costs its value and 0 marks a wall,
+# the same convention as the step costs of the robot maps. Sites are (x, y) cells, like the places of TSP.py.
+
+_sweeper = None  # Sweeper of a worker process, set once by the pool initializer
+
+
+def cost_grid(grid):
+    # Step cost array of a robot map Grid (step_cost), a GridWorld (bitmap of blocked cells) or an array-like
+    if hasattr(grid, "step_cost"):
+        return np.asarray(grid.step_cost, dtype=np.int32)
+    if hasattr(grid, "blocked"):
+        blocked = np.frombuffer(bytes(grid.blocked), dtype=np.uint8).reshape(grid.height, grid.width)
+        return (blocked == 0).astype(np.int32)
+    return np.asarray(grid, dtype=np.int32)
+
+
+class Sweeper:
+    # Runs shortest-path sweeps over one cost grid, reusing its per-cell buffers between sweeps
+    def __init__(self, costs):
+        self.height, self.width = costs.shape
+        self.size = self.height * self.width
+        self.costs = np.ascontiguousarray(costs, dtype=np.int32).ravel()
+        self.step_values = np.unique(self.costs[self.costs > 0]).tolist()
+        self.unreached = np.where(self.costs > 0, np.iinfo(np.int64).max, -1)  # Walls start out "settled"
+        self.dist = np.empty(self.size, dtype=np.int64)
+        self.is_target = np.empty(self.size, dtype=np.bool_)
+        self.stamp = np.empty(self.size, dtype=np.int64)  # Scratch space for removing duplicate cells without sorting
+
+    def sweep(self, source, targets):
+        # Shortest path cost from source to every target cell, or inf where a target cannot be reached.
+        # A Dial-style bucket Dijkstra run on whole buckets at once: all cells at the current distance are
+        # settled together and their neighbours relaxed with NumPy, so the Python work is per distance
+        # value, not per cell. With unit costs it is a plain breadth-first search. Stops once every target is settled.
+        # A cell is settled once its distance is at most the current one; walls are kept at -1 so they never open.
+        width, size, flat_costs = self.width, self.size, self.costs
+        step_values, dist, stamp = self.step_values, self.dist, self.stamp
+        np.copyto(dist, self.unreached)
+        target_ids = np.array([y * width + x for x, y in targets], dtype=np.int64)
+        self.is_target.fill(False)
+        self.is_target[target_ids[flat_costs[target_ids] > 0]] = True  # Targets in walls are never reached
+        remaining = int(self.is_target.sum())
+
+        origin = source[1] * width + source[0]
+        if flat_costs[origin] > 0:
+            dist[origin] = 0
+            buckets = {0: [np.array([origin], dtype=np.int64)]}
+        else:
+            buckets = {}  # A source inside a wall reaches nothing
+        while buckets and remaining:
+            current = min(buckets)
+            parts = buckets.pop(current)
+            cells = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            if len(step_values) > 1:
+                cells = cells[dist[cells] == current]  # Drop cells found again at a lower cost since
+            stamp[cells] = np.arange(len(cells))
+            cells = cells[stamp[cells] == np.arange(len(cells))]
+            remaining -= int(self.is_target[cells].sum())
+
+            # Neighbours in the four directions, without wrapping across rows
+            cols = cells % width
+            neighbors = np.concatenate((
+                cells[cols + 1 < width] + 1,
+                cells[cols > 0] - 1,
+                cells[cells < size - width] + width,
+                cells[cells >= width] - width,
+            ))
+            if len(step_values) > 1:
+                step_costs = flat_costs[neighbors]
+            for step in step_values:
+                # Every cell reached with this step cost gets the same distance, so plain assignment is safe
+                reached = neighbors[step_costs == step] if len(step_values) > 1 else neighbors
+                reached = reached[dist[reached] > current + step]
+                if len(reached):
+                    dist[reached] = current + step
+                    buckets.setdefault(current + step, []).append(reached)
+
+        found = dist[target_ids]
+        return np.where((found >= 0) & (found < np.iinfo(np.int64).max), found, np.inf)
+
+
+def sweep(costs, source, targets):
+    # Shortest path cost over a cost grid from source to every target cell, or inf where unreachable
+    return Sweeper(costs).sweep(source, targets)
+
+
+def _init_worker(costs):
+    global _sweeper
+    _sweeper = Sweeper(costs)
+
+
+def _sweep_row(job):
+    source, targets = job
+    return _sweeper.sweep(source, targets)
+
+
+def build_matrix(grid, sites, processes=None):
+    # Full site-to-site cost matrix of a grid. sites maps names to (x, y) cells.
+    # Returns (names, matrix), with matrix[i][j] the cost from names[i] to names[j] (inf if unreachable),
+    # ready to pass to TSPSolver(names, matrix). The sweeps are spread over processes workers
+    # (one per CPU by default); the cost grid is sent to each worker once.
+    costs = cost_grid(grid)
+    names = list(sites)
+    cells = [tuple(sites[name]) for name in names]
+    # Reversing a path swaps the cost of its first cell for the cost of its last one, so
+    # cost(b, a) = cost(a, b) + step(a) - step(b) and each source only sweeps to the sites after it
+    jobs = [(cell, cells[i:]) for i, cell in enumerate(cells)]
+    if processes == 1 or len(jobs) < 2:
+        _init_worker(costs)
+        rows = list(map(_sweep_row, jobs))
+    else:
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(costs,)) as pool:
+            chunksize = max(1, len(jobs) // (4 * (processes or multiprocessing.cpu_count())))
+            rows = list(pool.imap(_sweep_row, jobs, chunksize))
+
+    steps = np.array([costs[y, x] for x, y in cells], dtype=np.float64)
+    matrix = np.zeros((len(names), len(names)))
+    for i, row in enumerate(rows):
+        matrix[i, i:] = row
+        matrix[i:, i] = row + steps[i] - steps[i:]
+    return names, matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the site-to-site distance matrix of a random grid.")
+    parser.add_argument("--size", type=int, default=500, help="width and height of the grid")
+    parser.add_argument("--sites", type=int, default=50)
+    parser.add_argument("--walls", type=float, default=0.2, help="fraction of wall cells")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    costs = (rng.random((args.size, args.size)) >= args.walls).astype(np.int32)
+    free = np.flatnonzero(costs)
+    chosen = rng.choice(free, size=args.sites, replace=False)
+    sites = {"site%d" % i: (int(cell % args.size), int(cell // args.size)) for i, cell in enumerate(chosen)}
+
+    start_time = time.perf_counter()
+    names, matrix = build_matrix(costs, sites, args.jobs)
+    print("%d x %d matrix in %.2fs, %d unreachable pairs" % (
+        len(names), len(names), time.perf_counter() - start_time, int(np.isinf(matrix).sum())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+
+# Exact TSP by Held-Karp dynamic programming over subsets, for small (possibly asymmetric) instances.
+# The tour starts and ends at city 0. cost[mask, j] is the cheapest path that leaves city 0, visits
+# exactly the other cities in mask (bit j - 1 for city j) and ends at city j. Subsets are filled in
+# layers of equal size, one NumPy step per (layer, last city), so the Python work is O(n^2) while the
+# 2^(n-1) x (n-1) table does the O(2^n n^2) arithmetic. The predecessor table takes one byte per entry.
+
+
+def held_karp(matrix):
+    # Optimal tour of a distance matrix: returns (order of city indices starting at 0, total distance)
+    D = np.asarray(matrix, dtype=np.float64)
+    n = len(D)
+    if n == 0:
+        return [], 0.0
+    if n == 1:
+        return [0], float(D[0, 0])
+    m = n - 1                       # Cities other than the start, city j is bit j - 1
+    size = 1 << m
+    cost = np.full((size, m), np.inf)
+    previous = np.zeros((size, m), dtype=np.int8)
+    cities = np.arange(m)
+    cost[1 << cities, cities] = D[0, 1:]
+
+    masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.int8)
+    for bit in range(m):
+        popcount += ((masks >> bit) & 1).astype(np.int8)
+    steps = D[1:, 1:]               # steps[k, j]: from city k + 1 to city j + 1
+
+    for layer in range(2, m + 1):
+        layer_masks = masks[popcount == layer]
+        for j in range(m):
+            ending = layer_masks[(layer_masks >> j) & 1 == 1]
+            before = cost[ending ^ (1 << j)] + steps[:, j]   # Paths over the other cities, then on to j
+            best = np.argmin(before, axis=1)
+            cost[ending, j] = before[np.arange(len(ending)), best]
+            previous[ending, j] = best
+
+    full = size - 1
+    total = cost[full] + D[1:, 0]
+    last = int(np.argmin(total))
+    order = []
+    mask = full
+    while mask:
+        order.append(last + 1)
+        last, mask = int(previous[mask, last]), mask ^ (1 << last)
+    order.append(0)
+    order.reverse()
+    return order, float(np.min(total))
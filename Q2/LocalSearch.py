@@ -0,0 +1,217 @@
+import math
+import random
+from array import array
+from collections import deque
+
+import numpy as np
+
+import SpatialIndex as si  # Grid index for k-nearest-neighbour candidate lists
+
+# Local search for TSP tours with 2-opt and Or-opt moves.
+# Moves are only tried towards each city's k nearest neighbours (candidate lists), and a queue of
+# "active" cities plays the role of don't-look bits: a city is only looked at again once one of its
+# tour edges has changed. The tour is an array of cities plus the position of every city; both are
+# typed arrays shared with NumPy views, so single cities are read quickly from Python while the
+# shorter side of a 2-opt reversal is rewritten, positions included, in a few vectorized steps.
+# 2-opt reverses part of the tour, which is only free of charge for symmetric distances, so
+# asymmetric instances use Or-opt moves alone.
+
+EPSILON = 1e-9  # Smallest improvement that counts, so float round-off cannot make moves cycle
+
+
+def matrix_candidates(matrix, k):
+    # The k nearest other cities of every city in a distance matrix, nearest first
+    n = len(matrix)
+    k = min(k, n - 1)
+    candidates = []
+    for first in range(0, n, 1024):
+        block = np.array(matrix[first:first + 1024], dtype=np.float64)
+        block[np.arange(len(block)), np.arange(first, first + len(block))] = np.inf  # Never a city itself
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k] if k < n - 1 else np.tile(np.arange(n), (len(block), 1))
+        order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1, kind="stable")
+        for row, city in zip(np.take_along_axis(nearest, order, axis=1).tolist(), range(first, first + len(block))):
+            candidates.append([other for other in row if other != city][:k])
+    return candidates
+
+
+def coordinate_candidates(coords, k):
+    # The (approximately) k nearest other cities of every city given as (x, y) points, nearest first,
+    # from a grid index with about k points per cell
+    return si.GridIndex(coords, per_cell=k).knn(k)
+
+
+class LocalSearch:
+    # distance(a, b) gives the cost of the edge from city a to city b; candidates[a] lists the cities
+    # worth connecting a to, nearest first
+    def __init__(self, distance, candidates, symmetric=True):
+        self.distance = distance
+        self.candidates = candidates
+        self.symmetric = symmetric
+        self.two_opt_moves = 0
+        self.or_opt_moves = 0
+
+    @classmethod
+    def from_solver(cls, solver, k=8):
+        # Local search over the distance matrix of a TSPSolver; 2-opt is used only if the matrix is symmetric.
+        # A solver over place coordinates without a matrix takes its candidates from a spatial index instead.
+        if not isinstance(solver.matrix, np.ndarray):
+            return cls(solver.matrix, coordinate_candidates(solver.coords, k))
+        rows = solver.rows
+        return cls(lambda a, b: rows[a][b], matrix_candidates(solver.matrix, k),
+                   symmetric=bool(np.allclose(solver.matrix, solver.matrix.T)))
+
+    @classmethod
+    def from_coordinates(cls, coords, k=8):
+        # Local search over Euclidean distances between (x, y) points, which needs no distance matrix
+        xs = [float(x) for x, y in coords]
+        ys = [float(y) for x, y in coords]
+        hypot = math.hypot
+        return cls(lambda a, b: hypot(xs[a] - xs[b], ys[a] - ys[b]), coordinate_candidates(coords, k))
+
+    def tour_length(self, order):
+        distance = self.distance
+        return sum(distance(order[i - 1], order[i]) for i in range(len(order)))
+
+    def optimize(self, order=None):
+        # Improve a tour (a list of city indices, random if None) until no 2-opt or Or-opt move
+        # towards a candidate improves it. Returns the improved tour and its length.
+        n = len(self.candidates)
+        if order is None:
+            order = random.sample(range(n), n)
+        self.tour = array("q", order)
+        self.pos = array("q", bytes(8 * n))
+        self._tour = np.frombuffer(self.tour, dtype=np.int64)  # Views for the bulk rewrites
+        self._pos = np.frombuffer(self.pos, dtype=np.int64)
+        self._pos[self._tour] = np.arange(n)
+        if n >= 5:
+            active = [True] * n
+            queue = deque(self.tour)
+            while queue:
+                city = queue.popleft()
+                active[city] = False
+                touched = (self.symmetric and self._two_opt(city)) or self._or_opt(city)
+                if touched:
+                    for other in touched:
+                        if not active[other]:
+                            active[other] = True
+                            queue.append(other)
+        tour = self.tour.tolist()
+        return tour, self.tour_length(tour)
+
+    def _succ(self, city):
+        i = self.pos[city] + 1
+        return self.tour[i if i < len(self.tour) else 0]
+
+    def _pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def _cities(self, begin, count):
+        # Array of count cities of the tour from position begin on, wrapping around the end
+        tour = self._tour
+        end = begin + count
+        if end <= len(tour):
+            return tour[begin:end].copy()
+        return np.concatenate((tour[begin:], tour[:end - len(tour)]))
+
+    def _write(self, begin, cities):
+        # Put an array of cities into the tour from position begin on, wrapping around the end,
+        # and update their positions
+        tour, pos = self._tour, self._pos
+        n = len(tour)
+        head = min(len(cities), n - begin)
+        tour[begin:begin + head] = cities[:head]
+        pos[cities[:head]] = np.arange(begin, begin + head)
+        if head < len(cities):
+            tour[:len(cities) - head] = cities[head:]
+            pos[cities[head:]] = np.arange(len(cities) - head)
+
+    def _reverse(self, first, last):
+        # Reverse the tour path from city first forward to city last. When that path is longer than
+        # the rest of the tour the rest is reversed instead, which gives the same cyclic tour.
+        n = len(self.tour)
+        i, j = self.pos[first], self.pos[last]
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i = (j + 1) % n
+            length = n - length
+        self._write(i, self._cities(i, length)[::-1])
+
+    def _two_opt(self, a):
+        # Replace the tour edges at a and at a candidate c by edges a-c and their partners
+        distance = self.distance
+        for forward in (True, False):
+            b = self._succ(a) if forward else self._pred(a)
+            removed = distance(a, b)
+            for c in self.candidates[a]:
+                added = distance(a, c)
+                if added >= removed:
+                    break  # Candidates are sorted, so no later one can pay for the new edge
+                d = self._succ(c) if forward else self._pred(c)
+                if c == b or d == a:
+                    continue
+                if added + distance(b, d) - removed - distance(c, d) < -EPSILON:
+                    if forward:
+                        self._reverse(b, c)  # a b ... c d  becomes  a c ... b d
+                    else:
+                        self._reverse(c, b)  # d c ... b a  becomes  d b ... c a
+                    self.two_opt_moves += 1
+                    return (a, b, c, d)
+        return None
+
+    def _or_opt(self, a):
+        # Move the segment of 1 to 3 cities starting at a between a candidate c and its neighbour;
+        # for symmetric distances the segment may also be put back reversed
+        distance = self.distance
+        tour, pos = self.tour, self.pos
+        n = len(tour)
+        for length in (1, 2, 3):
+            if length > n - 3:
+                break
+            first, last = a, tour[(pos[a] + length - 1) % n]
+            segment = {tour[(pos[a] + i) % n] for i in range(length)}
+            p, nx = self._pred(first), self._succ(last)
+            gain = distance(p, first) + distance(last, nx) - distance(p, nx)
+            if gain <= EPSILON:
+                continue
+            for end in ((first, last) if self.symmetric and length > 1 else (first,)):
+                for c in self.candidates[end]:
+                    if c in segment:
+                        continue
+                    if self.symmetric and distance(end, c) >= gain:
+                        break  # Sorted by distance from end; asymmetric distances are not, so all are tried
+                    # Two places next to c: c -> segment -> succ(c), and pred(c) -> segment -> c
+                    for left, right in ((c, self._succ(c)), (self._pred(c), c)):
+                        if left in segment or right in segment:
+                            continue
+                        if end == first:
+                            # Segment kept in its direction: left -> first ... last -> right
+                            added = distance(left, first) + distance(last, right) - distance(left, right)
+                            reverse = False
+                        else:
+                            # Segment reversed: left -> last ... first -> right
+                            added = distance(left, last) + distance(first, right) - distance(left, right)
+                            reverse = True
+                        if added - gain < -EPSILON:
+                            self._move_segment(first, length, left, reverse)
+                            self.or_opt_moves += 1
+                            return (p, nx, first, last, left, right)
+        return None
+
+    def _move_segment(self, first, length, left, reverse):
+        # Move the length cities starting at first so they follow city left, rewriting only the
+        # stretch of the tour between the segment and its new place, going whichever way is shorter
+        tour, pos = self.tour, self.pos
+        n = len(tour)
+        start = pos[first]
+        after = (pos[left] - (start + length - 1)) % n      # Cities from the segment end forward to left
+        before = (start - pos[left] - 1) % n                 # Cities from after left forward to the segment
+        segment = self._cities(start, length)
+        if reverse:
+            segment = segment[::-1]
+        if after <= before:
+            # ... [segment] m1 ... left ...  becomes  ... m1 ... left [segment] ...
+            self._write(start, np.concatenate((self._cities((start + length) % n, after), segment)))
+        else:
+            # ... left m1 ... [segment] ...  becomes  ... left [segment] m1 ... ...
+            begin = (pos[left] + 1) % n
+            self._write(begin, np.concatenate((segment, self._cities(begin, before))))
@@ -0,0 +1,135 @@
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+import LocalSearch as ls  # 2-opt / Or-opt local search
+import TSP as tsp  # TSPSolver and HillClimbingTSP
+
+NEIGHBORHOODS = ("swap", "local")  # Random-swap hill climbing, or 2-opt / Or-opt local search
+
+_solver = None         # TSPSolver of a worker process, over the shared distance matrix
+_k = 8                 # Candidate list length of the worker's local search
+_local_search = None   # LocalSearch of a worker process, built on first use
+_memory = None         # Shared memory block the worker's matrix lives in, kept open while it runs
+
+
+def _init_worker(name, shape, dtype, k):
+    # Attach to the shared distance matrix once per worker instead of pickling it with every restart
+    global _memory
+    _memory = shared_memory.SharedMemory(name=name)
+    _use_matrix(np.ndarray(shape, dtype=dtype, buffer=_memory.buf), k)
+
+
+def _use_matrix(matrix, k):
+    # Same as _init_worker, for restarts run in this process. The solver indexes the matrix in place
+    # instead of keeping its own nested-list copy, so every worker reads the one shared block.
+    global _solver, _k, _local_search
+    _solver = tsp.TSPSolver(list(range(len(matrix))), matrix, copy_rows=False)
+    _k = k
+    _local_search = None
+
+
+def run_restart(job):
+    # One independent restart; every random draw comes from the restart's own seed
+    global _local_search
+    restart, seed, neighborhood, iterations = job
+    random.seed(seed)
+    start_time = time.perf_counter()
+    if neighborhood == "swap":
+        climber = tsp.HillClimbingTSP(_solver)
+        order, distance = climber.hill_climbing(iterations)
+        moves = climber.moves
+    else:
+        if _local_search is None:
+            _local_search = ls.LocalSearch.from_solver(_solver, k=_k)
+        before = _local_search.two_opt_moves + _local_search.or_opt_moves
+        order, distance = _local_search.optimize()
+        moves = _local_search.two_opt_moves + _local_search.or_opt_moves - before
+    return {
+        "restart": restart,
+        "seed": seed,
+        "neighborhood": neighborhood,
+        "worker": os.getpid(),
+        "distance": float(distance),
+        "moves": moves,
+        "wall_time": round(time.perf_counter() - start_time, 6),
+        "route": order,
+    }
+
+
+def multi_start(solver, restarts, iterations=10000, processes=None, seed=0, neighborhoods=("swap",), k=8):
+    # Run independent restarts of the hill climbing and/or local search across a process pool.
+    # Restart i uses neighborhoods[i % len(neighborhoods)] and a seed drawn from the master seed,
+    # so the result does not depend on the number of processes or on which worker runs what.
+    # The distance matrix is copied once into shared memory, which every worker maps.
+    # Returns the best route (place names), its distance, the per-restart records and per-worker totals.
+    # "moves" counts accepted moves (improving swaps, or 2-opt and Or-opt moves) for either neighborhood.
+    for neighborhood in neighborhoods:
+        if neighborhood not in NEIGHBORHOODS:
+            raise ValueError("unknown neighborhood: %s" % neighborhood)
+    master = random.Random(seed)
+    jobs = [(restart, master.getrandbits(63), neighborhoods[restart % len(neighborhoods)], iterations)
+            for restart in range(restarts)]
+    # A solver over place coordinates computes its distances lazily; the workers get them as a dense matrix
+    matrix = np.ascontiguousarray(solver.matrix if isinstance(solver.matrix, np.ndarray) else solver.matrix.dense())
+
+    if processes == 1:
+        _use_matrix(matrix, k)
+        records = [run_restart(job) for job in jobs]
+    else:
+        memory = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=memory.buf)[...] = matrix
+            with Pool(processes, initializer=_init_worker,
+                      initargs=(memory.name, matrix.shape, matrix.dtype.str, k)) as pool:
+                records = list(pool.imap_unordered(run_restart, jobs))
+        finally:
+            memory.close()
+            memory.unlink()
+
+    records.sort(key=lambda record: record["restart"])
+    best = min(records, key=lambda record: (record["distance"], record["restart"]))
+    workers = {}
+    for record in records:
+        totals = workers.setdefault(record["worker"], {"restarts": 0, "moves": 0, "busy_time": 0.0, "best": float("inf")})
+        totals["restarts"] += 1
+        totals["moves"] += record["moves"]
+        totals["busy_time"] += record["wall_time"]
+        totals["best"] = min(totals["best"], record["distance"])
+    return {
+        "route": [solver.names[city] for city in best["route"]],
+        "distance": best["distance"],
+        "restarts": records,
+        "workers": workers,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-start TSP solving on random points across a process pool.")
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--restarts", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=100000, help="hill climbing iterations per swap restart")
+    parser.add_argument("--neighborhoods", default="swap", help="comma separated: " + ", ".join(NEIGHBORHOODS))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="master seed of the instance and the restarts")
+    args = parser.parse_args(argv)
+
+    points = np.random.default_rng(args.seed).random((args.cities, 2)) * 100
+    matrix = np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    solver = tsp.TSPSolver(list(range(args.cities)), matrix)
+
+    start_time = time.perf_counter()
+    result = multi_start(solver, args.restarts, args.iterations, args.jobs, args.seed, args.neighborhoods.split(","))
+    elapsed = time.perf_counter() - start_time
+    print("best distance %.3f over %d restarts in %.2fs" % (result["distance"], args.restarts, elapsed))
+    for worker, totals in sorted(result["workers"].items()):
+        print("worker %-8d %3d restarts  %10d moves  %8.2fs busy  best %.3f" % (
+            worker, totals["restarts"], totals["moves"], totals["busy_time"], totals["best"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+# Uniform grid index over 2-D points. The bounding square of the points is cut into square cells
+# holding about per_cell points each; k-nearest-neighbour lists are computed a cell at a time with
+# NumPy, and nearest-point queries search rings of cells outwards, skipping points that were removed.
+
+
+class GridIndex:
+    def __init__(self, coords, per_cell=2):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(self.coords)
+        self.low = self.coords.min(axis=0) if n else np.zeros(2)
+        extent = float((self.coords.max(axis=0) - self.low).max()) if n else 0.0
+        self.side = max(1, int(math.sqrt(n / max(per_cell, 1))))   # Cells per side
+        self.cell_size = max(extent, 1e-12) / self.side
+        cell_xy = np.minimum(((self.coords - self.low) / self.cell_size).astype(np.int64), self.side - 1)
+        self.cell_of = cell_xy[:, 1] * self.side + cell_xy[:, 0]
+        self.by_cell = np.argsort(self.cell_of, kind="stable")
+        self.bounds = np.searchsorted(self.cell_of[self.by_cell], np.arange(self.side * self.side + 1))
+        self.buckets = None                # Live points per cell, built by the first nearest() query
+        self.xs = self.coords[:, 0].tolist()
+        self.ys = self.coords[:, 1].tolist()
+
+    def _cell_points(self, cx, cy):
+        cell = cy * self.side + cx
+        return self.by_cell[self.bounds[cell]:self.bounds[cell + 1]]
+
+    def knn(self, k):
+        # The (approximately) k nearest other points of every point, nearest first. Each cell's points
+        # are compared with all points of the 3 x 3 block of cells around it in one NumPy step.
+        n = len(self.coords)
+        neighbors = [[] for _ in range(n)]
+        side = self.side
+        for cy in range(side):
+            for cx in range(side):
+                members = self._cell_points(cx, cy)
+                if not len(members):
+                    continue
+                block = np.concatenate([self._cell_points(x, y)
+                                        for y in range(max(cy - 1, 0), min(cy + 2, side))
+                                        for x in range(max(cx - 1, 0), min(cx + 2, side))])
+                count = min(k, len(block) - 1)
+                if count <= 0:
+                    continue
+                offsets = self.coords[members][:, None, :] - self.coords[block][None, :, :]
+                dist = np.hypot(offsets[:, :, 0], offsets[:, :, 1])
+                dist[members[:, None] == block[None, :]] = np.inf
+                nearest = np.argpartition(dist, count - 1, axis=1)[:, :count]
+                order = np.argsort(np.take_along_axis(dist, nearest, axis=1), axis=1, kind="stable")
+                for point, row in zip(members.tolist(), block[np.take_along_axis(nearest, order, axis=1)].tolist()):
+                    neighbors[point] = row
+        return neighbors
+
+    def remove(self, point):
+        # Take a point out of the nearest() queries
+        if self.buckets is None:
+            self._build_buckets()
+        bucket = self.buckets[int(self.cell_of[point])]
+        bucket.remove(point)
+        self.live -= 1
+
+    def _build_buckets(self):
+        self.buckets = [self.by_cell[self.bounds[cell]:self.bounds[cell + 1]].tolist()
+                        for cell in range(self.side * self.side)]
+        self.live = len(self.coords)
+
+    def nearest(self, x, y):
+        # The live point closest to (x, y), or None once every point has been removed
+        if self.buckets is None:
+            self._build_buckets()
+        if not self.live:
+            return None
+        side, size, buckets, xs, ys = self.side, self.cell_size, self.buckets, self.xs, self.ys
+        cx = min(max(int((x - self.low[0]) / size), 0), side - 1)
+        cy = min(max(int((y - self.low[1]) / size), 0), side - 1)
+        best, best_dist = None, math.inf
+        for ring in range(side):
+            # Every point in ring r or further out is at least (r - 1) cells from (x, y)
+            if best is not None and best_dist <= (ring - 1) * size:
+                break
+            for gy in range(max(cy - ring, 0), min(cy + ring, side - 1) + 1):
+                edge = gy == cy - ring or gy == cy + ring
+                for gx in (range(max(cx - ring, 0), min(cx + ring, side - 1) + 1) if edge else
+                           [g for g in (cx - ring, cx + ring) if 0 <= g < side]):
+                    for point in buckets[gy * side + gx]:
+                        d = math.hypot(xs[point] - x, ys[point] - y)
+                        if d < best_dist:
+                            best, best_dist = point, d
+        return best
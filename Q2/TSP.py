@@ -1,31 +1,195 @@
 #These libraries are used for generating random numbers, visualization, and numerical operations, respectively.
+import math
 import random
-import matplotlib.pyplot as plt
+import time
 import numpy as np
 
+import Construction as cs  # Start tours from place coordinates
+import HeldKarp as hk  # Exact solver for small instances
+
+HELD_KARP_LIMIT = 20  # Largest number of places solve() handles exactly; the DP grows as 2^n n^2 (about 1s and 90 MB at 20)
+
+#This defines a class MetricOracle that works out distances between places from their coordinates when they are asked for,
+# so no n x n matrix has to exist. metric is "euclidean", "manhattan" or a function of two (x, y) points. Computed distances
+# are cached (up to cache_size of them, then the cache starts over), which pays off when the metric function is expensive.
+# oracle(a, b) and oracle.rows[a][b] give one distance and oracle[A, B] a NumPy array of them, so the oracle can stand in for the matrix.
+class MetricOracle:
+    def __init__(self, coords, metric="euclidean", cache_size=1 << 20):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.metric = metric
+        self.cache = {}
+        self.cache_size = cache_size
+        self.n = len(self.coords)
+        self.shape = (self.n, self.n)
+        self.xs = self.coords[:, 0].tolist()
+        self.ys = self.coords[:, 1].tolist()
+        self.rows = [_OracleRow(self, a) for a in range(self.n)]
+
+    def __len__(self):
+        return self.n
+
+    def __call__(self, a, b):
+        key = a * self.n + b if a <= b else b * self.n + a   # Metrics are symmetric, so both directions share an entry
+        distance = self.cache.get(key)
+        if distance is None:
+            if self.metric == "euclidean":
+                distance = math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+            elif self.metric == "manhattan":
+                distance = abs(self.xs[a] - self.xs[b]) + abs(self.ys[a] - self.ys[b])
+            else:
+                distance = self.metric((self.xs[a], self.ys[a]), (self.xs[b], self.ys[b]))
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[key] = distance
+        return distance
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.rows[key]
+        A, B = np.broadcast_arrays(*key)
+        offsets = self.coords[A] - self.coords[B]
+        if self.metric == "euclidean":
+            return np.hypot(offsets[..., 0], offsets[..., 1])
+        if self.metric == "manhattan":
+            return np.abs(offsets).sum(axis=-1)
+        return np.vectorize(self, otypes=[np.float64])(A, B)
+
+    #This method builds the full distance matrix, for callers that need one (e.g. the exact solver on a few places)
+    def dense(self):
+        everything = np.arange(self.n)
+        return self[everything[:, None], everything[None, :]]
+
+class _OracleRow:
+    def __init__(self, oracle, a):
+        self.oracle = oracle
+        self.a = a
+
+    def __getitem__(self, b):
+        return self.oracle(self.a, b)
+
 #This defines a class TSPSolver that represents a solver for the Traveling Salesman Problem (TSP). It has an initializer method __init__ that takes places and distances as input parameters.
 # places is a list of place names, and distances is a dictionary containing distances between places.
+# distances may also be a dense matrix (e.g. from GridDistanceMatrix.build_matrix) whose rows and columns follow the order of places.
+# Place names are interned to integer indices: index maps each name to its row, matrix holds the distances as a NumPy array,
+# and rows holds the same distances as nested lists, which are faster to index one element at a time in the search loops.
+# When places is a dictionary of place names and (x, y) coordinates, coords holds them as an array. If distances is then left out,
+# matrix and rows are a MetricOracle over the coordinates (see metric there), so large instances need no n x n memory.
+# With copy_rows=False a NumPy matrix is not copied into nested lists: rows are memoryviews of its rows instead, which index
+# almost as fast and share the matrix's memory (e.g. a shared-memory block mapped by several worker processes).
 class TSPSolver:
-    def __init__(self, places, distances):
+    def __init__(self, places, distances=None, metric="euclidean", copy_rows=True):
         self.places = places
         self.distances = distances
+        self.names = list(places)
+        self.index = {place: i for i, place in enumerate(self.names)}
+        self.coords = np.array([places[name] for name in self.names], dtype=np.float64).reshape(-1, 2) if isinstance(places, dict) else None
+        if distances is None:
+            if self.coords is None:
+                raise ValueError("distances can only be left out when places maps names to (x, y) coordinates")
+            self.matrix = MetricOracle(self.coords, metric)
+            self.rows = self.matrix.rows
+            return
+        if isinstance(distances, np.ndarray):
+            self.matrix = distances
+        else:
+            self.matrix = np.array([[distances[a][b] for b in self.names] for a in self.names])
+        self.rows = self.matrix.tolist() if copy_rows else [memoryview(row) for row in self.matrix]
+
+    #This method builds a start route as place indices: "random", "nearest" (nearest neighbour), "greedy" (greedy edge) or
+    #"spacefill" (Hilbert curve order). Apart from "random" and "nearest" it needs place coordinates; with them every method
+    #runs in about O(n log n) on a spatial index, without a distance matrix.
+    def construct(self, method="random"):
+        n = len(self.names)
+        if method == "random":
+            return random.sample(range(n), n)
+        if self.coords is None:
+            if method == "nearest" and n:
+                return self._matrix_nearest_neighbor()
+            if method in ("nearest", "greedy", "spacefill"):
+                raise ValueError("the %s start needs place coordinates" % method)
+        if method == "nearest":
+            return cs.nearest_neighbor_tour(self.coords)
+        if method == "greedy":
+            return cs.greedy_edge_tour(self.coords)
+        if method == "spacefill":
+            return cs.space_filling_curve_tour(self.coords)
+        raise ValueError("unknown start: %s" % method)
+
+    def _matrix_nearest_neighbor(self):
+        unvisited = np.ones(len(self.names), dtype=np.bool_)
+        route = [0]
+        unvisited[0] = False
+        for _ in range(len(self.names) - 1):
+            row = np.where(unvisited, self.matrix[route[-1]], np.inf)
+            route.append(int(np.argmin(row)))
+            unvisited[route[-1]] = False
+        return route
 
  #This method calculates the total distance of a given route (the visiting order) for all the places. 
 #It iterates over the given route and sums up the distances between consecutive cities, including the distance from the last city back to the starting city.   
     def calculate_total_distance(self, route):
+        return self.order_distance([self.index[place] for place in route])
+
+    #This method finds a route for all places: exactly with Held-Karp when there are at most exact_limit places,
+    #otherwise with hill climbing for the given number of iterations. Returns the route and its total distance like hill_climbing.
+    def solve(self, iterations=1000, exact_limit=HELD_KARP_LIMIT):
+        if len(self.names) <= exact_limit:
+            matrix = self.matrix if isinstance(self.matrix, np.ndarray) else self.matrix.dense()
+            order, total_distance = hk.held_karp(matrix)
+            return [self.names[i] for i in order], self.order_distance(order) if order else 0
+        return HillClimbingTSP(self).hill_climbing(iterations)
+
+    #Same as calculate_total_distance, for a route given as place indices
+    def order_distance(self, order):
+        rows = self.rows
         total_distance = 0
-        for i in range(len(route) - 1):
-            current_city = route[i]
-            next_city = route[i + 1]
-            total_distance += self.distances[current_city][next_city]
-        total_distance += self.distances[route[-1]][route[0]]  # Return to starting point
+        for i in range(len(order) - 1):
+            total_distance += rows[order[i]][order[i + 1]]
+        total_distance += rows[order[-1]][order[0]]  # Return to starting point
         return total_distance
 
+#This defines a class SearchTelemetry that records how an anytime search converged, to tune time budgets from data.
+# improvements holds one (seconds since start, iteration, distance) entry per improving route, starting with the initial route.
+class SearchTelemetry:
+    def __init__(self):
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.improvements = []
+        self.stop_reason = None
+
+    def record(self, elapsed, iteration, distance):
+        self.improvements.append((elapsed, iteration, distance))
+
+    @property
+    def iterations_per_second(self):
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def best_distance(self):
+        return self.improvements[-1][2] if self.improvements else None
+
+    @property
+    def time_to_best(self):
+        return self.improvements[-1][0] if self.improvements else None
+
+    def as_dict(self):
+        return {
+            "iterations": self.iterations,
+            "elapsed": self.elapsed,
+            "iterations_per_second": self.iterations_per_second,
+            "best_distance": self.best_distance,
+            "time_to_best": self.time_to_best,
+            "stop_reason": self.stop_reason,
+            "improvements": self.improvements,
+        }
+
 #This defines a class HillClimbingTSP that represents a solver using the hill climbing algorithm for the TSP.
 # It has an initializer method __init__ that takes a solver object as input parameter
+# moves counts the swaps hill_climbing has made (accepted moves, not iterations).
 class HillClimbingTSP:
     def __init__(self, solver):
         self.solver = solver
+        self.moves = 0
 
     #This method generates a random initial route visiting all places.
    # It converts the set of places into a list, then uses random.sample() to shuffle the list and return a random route.
@@ -40,59 +204,264 @@ class HillClimbingTSP:
         new_route[idx1], new_route[idx2] = new_route[idx2], new_route[idx1]
         return new_route
 
+    #This method returns how much the total distance of an index route changes when the places at positions i and j are swapped.
+    #A swap only changes the edges leaving positions i - 1, i, j - 1 and j, so only those are compared, in O(1).
+    #Both directions of every edge are looked up as they are, so asymmetric distances are handled too.
+    def swap_delta(self, order, i, j):
+        rows = self.solver.rows
+        n = len(order)
+        edges = {(i - 1) % n, i, (j - 1) % n, j}
+        before = 0
+        for k in edges:
+            before += rows[order[k]][order[(k + 1) % n]]
+        order[i], order[j] = order[j], order[i]
+        after = 0
+        for k in edges:
+            after += rows[order[k]][order[(k + 1) % n]]
+        order[i], order[j] = order[j], order[i]
+        return after - before
+
  #This method implements the core logic of hill climbing for the TSP. 
 #It starts with a random initial route and iteratively explores neighboring solutions. If a neighboring route has a shorter total distance, it replaces the current route with the neighbor.   
-    def hill_climbing(self, max_iterations):
-        current_route = self.generate_random_route()
-        current_distance = self.solver.calculate_total_distance(current_route)
+#The route is kept as place indices and changed in place; every swap is scored with swap_delta instead of re-adding the whole route.
+#start picks the start route, see TSPSolver.construct; the same goes for the other search modes below.
+    def hill_climbing(self, max_iterations, start="random"):
+        n = len(self.solver.names)
+        current_route = self.solver.construct(start)  # A "random" start makes the same random draws as generate_random_route
+        current_distance = self.solver.order_distance(current_route)
 
         for _ in range(max_iterations):
-            neighbour_route = self.explore_neighbours(current_route)
-            neighbour_distance = self.solver.calculate_total_distance(neighbour_route)
+            idx1, idx2 = random.sample(range(n), 2)
+            delta = self.swap_delta(current_route, idx1, idx2)
 
-            if neighbour_distance < current_distance:
-                current_route = neighbour_route
-                current_distance = neighbour_distance
+            if delta < 0:
+                current_route[idx1], current_route[idx2] = current_route[idx2], current_route[idx1]
+                current_distance += delta
+                self.moves += 1
 
-        return current_route, current_distance
+        return [self.solver.names[i] for i in current_route], current_distance
+
+    #This method is the anytime version of hill_climbing: a generator that yields (route, distance) for the random start route and
+    #then for every route that improves on it, so the caller always holds the best route so far and can stop whenever it likes.
+    #It stops by itself at the deadline (a time.monotonic() value), after time_limit seconds, after patience iterations
+    #without an improvement, or after max_iterations iterations, whichever comes first. The clock is read every check_every iterations.
+    #If a SearchTelemetry is passed it is filled in as the search runs; its counters and stop_reason are final once the generator
+    #finishes or is closed, and stop_reason is "stopped by caller" when the caller closed it early.
+    def anytime(self, deadline=None, time_limit=None, patience=None, max_iterations=None, telemetry=None, check_every=64, start="random"):
+        started = time.monotonic()
+        if time_limit is not None:
+            deadline = started + time_limit if deadline is None else min(deadline, started + time_limit)
+        if telemetry is None:
+            telemetry = SearchTelemetry()
+        names = self.solver.names
+        n = len(names)
+        current_route = self.solver.construct(start)
+        current_distance = self.solver.order_distance(current_route)
+        iteration = 0
+        last_improvement = 0
+        try:
+            telemetry.record(time.monotonic() - started, 0, current_distance)
+            yield [names[i] for i in current_route], current_distance
+
+            if n < 2:
+                telemetry.stop_reason = "too few places"
+            while n >= 2:
+                if max_iterations is not None and iteration >= max_iterations:
+                    telemetry.stop_reason = "max_iterations"
+                    break
+                if patience is not None and iteration - last_improvement >= patience:
+                    telemetry.stop_reason = "patience"
+                    break
+                if deadline is not None and iteration % check_every == 0 and time.monotonic() >= deadline:
+                    telemetry.stop_reason = "deadline"
+                    break
+                iteration += 1
+                idx1, idx2 = random.sample(range(n), 2)
+                delta = self.swap_delta(current_route, idx1, idx2)
+
+                if delta < 0:
+                    current_route[idx1], current_route[idx2] = current_route[idx2], current_route[idx1]
+                    current_distance += delta
+                    last_improvement = iteration
+                    telemetry.record(time.monotonic() - started, iteration, current_distance)
+                    yield [names[i] for i in current_route], current_distance
+        except GeneratorExit:
+            telemetry.stop_reason = "stopped by caller"  # The caller closed the generator (or dropped it) before it finished
+            raise
+        finally:
+            telemetry.iterations = iteration
+            telemetry.elapsed = time.monotonic() - started
+
+    #This method scores swapping the places at positions I[k] < J[k] of an index route, for whole arrays of position pairs at once.
+    #Pairs that are next to each other in the (cyclic) route share an edge, so they are scored with their own three-edge formula.
+    def swap_deltas(self, order, I, J):
+        D = self.solver.matrix
+        n = len(order)
+        T = order[np.arange(n)]
+        P = order[np.arange(n) - 1]
+        N = order[(np.arange(n) + 1) % n]
+        delta = (D[P[I], T[J]] + D[T[J], N[I]] + D[P[J], T[I]] + D[T[I], N[J]]
+                 - D[P[I], T[I]] - D[T[I], N[I]] - D[P[J], T[J]] - D[T[J], N[J]])
+        # Adjacent pairs: first is the position that comes right before second in the route
+        wrap = (I == 0) & (J == n - 1)
+        adjacent = (J == I + 1) | wrap
+        first = np.where(wrap, J, I)[adjacent]
+        second = np.where(wrap, I, J)[adjacent]
+        p, a, b, nx = P[first], T[first], T[second], N[second]
+        delta[adjacent] = D[p, b] + D[b, a] + D[a, nx] - D[p, a] - D[a, b] - D[b, nx]
+        return delta
+
+    #This method scores 2-opt moves that reverse the route between positions I[k] + 1 and J[k] (I[k] < J[k]), for whole arrays of pairs at once.
+    #Reversing a stretch also turns its inner edges around; a prefix sum of how much each edge changes when turned around
+    #adds that in O(1) per move, so asymmetric distances are scored correctly too.
+    def two_opt_deltas(self, order, I, J):
+        D = self.solver.matrix
+        n = len(order)
+        N = order[(np.arange(n) + 1) % n]
+        forward = D[order, N]
+        turned = np.cumsum(D[N, order] - forward)
+        inner = turned[J - 1] - turned[I]
+        return D[order[I], order[J]] + D[N[I], N[J]] - forward[I] - forward[J] + inner
+
+    def _apply(self, order, neighborhood, i, j):
+        if neighborhood == "swap":
+            order[i], order[j] = order[j], order[i]
+        else:
+            order[i + 1:j + 1] = order[i + 1:j + 1][::-1].copy()
+
+    def _deltas(self, order, neighborhood, I, J):
+        if neighborhood == "swap":
+            return self.swap_deltas(order, I, J)
+        if neighborhood == "2opt":
+            return self.two_opt_deltas(order, I, J)
+        raise ValueError("unknown neighborhood: %s" % neighborhood)
+
+    #This method is the steepest-descent mode: every step scores the whole swap (or 2-opt) neighborhood of the route in one batch
+    #and makes the best move, until no move shortens the route or max_steps moves were made.
+    def steepest_descent(self, neighborhood="swap", max_steps=None, start="random"):
+        n = len(self.solver.names)
+        current_route = np.array(self.solver.construct(start), dtype=np.int64)
+        current_distance = self.solver.order_distance(current_route.tolist())
+        if n > 3:
+            I, J = np.triu_indices(n, 1)
+            steps = 0
+            while max_steps is None or steps < max_steps:
+                deltas = self._deltas(current_route, neighborhood, I, J)
+                best = int(np.argmin(deltas))
+                if deltas[best] >= -1e-9:
+                    break
+                self._apply(current_route, neighborhood, I[best], J[best])
+                current_distance += deltas[best]
+                steps += 1
+        return [self.solver.names[i] for i in current_route.tolist()], current_distance
+
+    #This method is the simulated-annealing mode: every step scores batch_size random swap (or 2-opt) moves at once and picks the best of them,
+    #which is made if it shortens the route, or otherwise with probability exp(-delta / temperature).
+    #The temperature starts at temperature (by default the spread of the move scores on the random start route)
+    #and follows schedule(step, temperature) if given, or else is multiplied by cooling after every step. The best route seen is returned.
+    def simulated_annealing(self, steps, batch_size=64, neighborhood="swap", temperature=None, cooling=0.999, schedule=None, start="random"):
+        n = len(self.solver.names)
+        current_route = np.array(self.solver.construct(start), dtype=np.int64)
+        current_distance = self.solver.order_distance(current_route.tolist())
+        best_route, best_distance = current_route.copy(), current_distance
+        if n <= 3:
+            return [self.solver.names[i] for i in best_route.tolist()], best_distance
+        rng = np.random.default_rng(random.getrandbits(64))
+
+        def sample():
+            a = rng.integers(0, n, batch_size)
+            b = (a + rng.integers(1, n, batch_size)) % n   # Never the same position twice
+            return np.minimum(a, b), np.maximum(a, b)
+
+        if temperature is None:
+            temperature = float(np.std(self._deltas(current_route, neighborhood, *sample()))) or 1.0
+        start_temperature = temperature
+        for step in range(steps):
+            I, J = sample()
+            deltas = self._deltas(current_route, neighborhood, I, J)
+            pick = int(np.argmin(deltas))
+            delta = deltas[pick]
+            if delta < 0 or (temperature > 0 and rng.random() < np.exp(-delta / temperature)):
+                self._apply(current_route, neighborhood, I[pick], J[pick])
+                current_distance += delta
+                if current_distance < best_distance - 1e-9:
+                    best_route, best_distance = current_route.copy(), current_distance
+            temperature = schedule(step + 1, start_temperature) if schedule is not None else temperature * cooling
+
+        return [self.solver.names[i] for i in best_route.tolist()], self.solver.order_distance(best_route.tolist())
+
+#Matplotlib is only imported once a route is drawn, so importing the solver stays fast. Routes written to files are drawn on
+# a bare Agg figure, which needs no display and never goes through pyplot; the interactive window still uses pyplot.
+def _route_figure(places, interactive=False):
+    if interactive:
+        import matplotlib.pyplot as plt
+        figure = plt.figure(figsize=(8, 6))
+    else:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(8, 6))
+        FigureCanvasAgg(figure)
+    from matplotlib.collections import LineCollection
 
-#This function visualizes a route on a scatter plot. It takes places, a dictionary of place names and their coordinates, and route, a list representing the route. 
-#It plots the places as blue dots, the starting place as a green dot, and the route as black lines connecting the places. Finally, it adds titles, labels, and grid to the plot and displays it using plt.show().
-def visualize_route(places, route):
     x_coords = [place[0] for place in places.values()]
     y_coords = [place[1] for place in places.values()]
+    axes = figure.add_subplot()
+    axes.plot(x_coords, y_coords, 'bo')  # Plot cities
+    axes.plot(x_coords[0], y_coords[0], 'go')  # Plot starting city
+    lines = LineCollection([], colors='k', zorder=1)  # The whole route, one segment per edge
+    axes.add_collection(lines)
+    axes.set_title('TSP Route')
+    axes.set_xlabel('X Coordinate')
+    axes.set_ylabel('Y Coordinate')
+    axes.grid(True)
+    return figure, lines
+
+#The edges of a route as an array of segments ((x1, y1), (x2, y2)), including the one back to the starting point.
+def _route_segments(places, route):
+    points = np.array([places[place] for place in route], dtype=np.float64).reshape(-1, 2)
+    return np.stack((points, np.roll(points, -1, axis=0)), axis=1)
+
+#This function visualizes a route on a scatter plot. It takes places, a dictionary of place names and their coordinates, and route, a list representing the route. 
+#It plots the places as blue dots, the starting place as a green dot, and the route as black lines connecting the places. Finally, it adds titles, labels, and grid to the plot and displays it using plt.show().
+#Given a filename the plot is written to that file instead (the format follows the extension) and nothing is shown.
+def visualize_route(places, route, filename=None):
+    figure, lines = _route_figure(places, interactive=filename is None)
+    lines.set_segments(_route_segments(places, route))
+    if filename is None:
+        import matplotlib.pyplot as plt
+        plt.show()
+    else:
+        figure.savefig(filename)
 
-    plt.figure(figsize=(8, 6))
-    plt.plot(x_coords, y_coords, 'bo')  # Plot cities
-    plt.plot(x_coords[0], y_coords[0], 'go')  # Plot starting city
-    for i in range(len(route) - 1):
-        city1 = route[i]
-        city2 = route[i + 1]
-        plt.plot([places[city1][0], places[city2][0]], [places[city1][1], places[city2][1]], 'k-')  # Plot route
-    plt.plot([places[route[-1]][0], places[route[0]][0]], [places[route[-1]][1], places[route[0]][1]], 'k-')  # Return to starting point
-    plt.title('TSP Route')
-    plt.xlabel('X Coordinate')
-    plt.ylabel('Y Coordinate')
-    plt.grid(True)
-    plt.show()
+#This function writes many routes over the same places to files, e.g. the snapshots of a search. The figure is set up once and
+# only the route's line collection (and the title, if titles are given) changes from one file to the next.
+def render_routes(places, routes, filenames, titles=None):
+    figure, lines = _route_figure(places)
+    axes = figure.axes[0]
+    for i, (route, filename) in enumerate(zip(routes, filenames)):
+        lines.set_segments(_route_segments(places, route))
+        if titles is not None:
+            axes.set_title(titles[i])
+        figure.savefig(filename)
 
 # It defines the places and distances, creates instances of the TSP solver and hill climbing solver, runs the hill climbing algorithm to find the final route, prints the final route 
 #and its total distance, and visualizes the route using the visualize_route() function.
-places = {'Dorado Park': (0, 0), 'Khomasdal': (3, 1), 'Katutura': (1, 3), 'Eros': (4, 3), 'Klein Windhoek': (2, 0)}
-distances = {
-
-    'Dorado Park': {'Dorado Park': 0, 'Khomasdal': 7, 'Katutura': 20, 'Eros': 15, 'Klein Windhoek': 12},
-    'Khomasdal': {'Dorado Park': 10, 'Khomasdal': 0, 'Katutura': 6, 'Eros': 14, 'Klein Windhoek': 18},
-    'Katutura': {'Dorado Park': 20, 'Khomasdal': 6, 'Katutura': 0, 'Eros': 15, 'Klein Windhoek': 30},
-    'Eros': {'Dorado Park': 15, 'Khomasdal': 14, 'Katutura': 25, 'Eros': 0, 'Klein Windhoek': 2},
-    'Klein Windhoek': {'Dorado Park': 12, 'Khomasdal': 18, 'Katutura': 30, 'Eros': 2, 'Klein Windhoek': 0}
-    
-}
-
-tsp_solver = TSPSolver(places.keys(), distances)
-hill_climbing_solver = HillClimbingTSP(tsp_solver)
-final_route, total_distance = hill_climbing_solver.hill_climbing(1000)
-print("Final route found by hill climbing:", final_route)
-print("Total distance of the final route:", total_distance)
-
-visualize_route(places, final_route)
+if __name__ == "__main__":
+    places = {'Dorado Park': (0, 0), 'Khomasdal': (3, 1), 'Katutura': (1, 3), 'Eros': (4, 3), 'Klein Windhoek': (2, 0)}
+    distances = {
+
+        'Dorado Park': {'Dorado Park': 0, 'Khomasdal': 7, 'Katutura': 20, 'Eros': 15, 'Klein Windhoek': 12},
+        'Khomasdal': {'Dorado Park': 10, 'Khomasdal': 0, 'Katutura': 6, 'Eros': 14, 'Klein Windhoek': 18},
+        'Katutura': {'Dorado Park': 20, 'Khomasdal': 6, 'Katutura': 0, 'Eros': 15, 'Klein Windhoek': 30},
+        'Eros': {'Dorado Park': 15, 'Khomasdal': 14, 'Katutura': 25, 'Eros': 0, 'Klein Windhoek': 2},
+        'Klein Windhoek': {'Dorado Park': 12, 'Khomasdal': 18, 'Katutura': 30, 'Eros': 2, 'Klein Windhoek': 0}
+
+    }
+
+    tsp_solver = TSPSolver(places.keys(), distances)
+    hill_climbing_solver = HillClimbingTSP(tsp_solver)
+    final_route, total_distance = hill_climbing_solver.hill_climbing(1000)
+    print("Final route found by hill climbing:", final_route)
+    print("Total distance of the final route:", total_distance)
+
+    visualize_route(places, final_route)
@@ -0,0 +1,45 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import HeldKarp as hk
+import TSP as tsp
+
+
+def tour_length(matrix, order):
+    return sum(matrix[a][b] for a, b in zip(order, order[1:] + order[:1]))
+
+
+def brute_force(matrix):
+    # Length of the shortest tour, trying every order of the cities after city 0
+    n = len(matrix)
+    return min(tour_length(matrix, [0] + list(rest)) for rest in itertools.permutations(range(1, n)))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_brute_force_on_asymmetric_matrices(seed):
+    rng = np.random.default_rng(seed)
+    n = 2 + seed % 7
+    matrix = rng.integers(1, 100, (n, n)).astype(np.float64)
+    np.fill_diagonal(matrix, 0)
+    order, distance = hk.held_karp(matrix)
+
+    assert order[0] == 0 and sorted(order) == list(range(n))
+    assert distance == pytest.approx(tour_length(matrix, order))
+    assert distance == pytest.approx(brute_force(matrix))
+
+
+def test_trivial_instances():
+    assert hk.held_karp(np.zeros((0, 0))) == ([], 0.0)
+    assert hk.held_karp(np.zeros((1, 1))) == ([0], 0.0)
+
+
+def test_solver_uses_the_exact_tour_for_small_instances():
+    rng = np.random.default_rng(0)
+    matrix = rng.random((7, 7)) * 10
+    names = ["p%d" % i for i in range(7)]
+    route, distance = tsp.TSPSolver(names, matrix).solve()
+
+    assert sorted(route) == names
+    assert distance == pytest.approx(brute_force(matrix))
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+import LocalSearch as ls
+
+
+def tour_length(matrix, order):
+    return sum(matrix[order[i - 1]][order[i]] for i in range(len(order)))
+
+
+def cycle(order, directed=True):
+    # Tour as a list starting at city 0; undirected tours are also read in the direction with the
+    # smaller second city, so the same cycle always gives the same list
+    start = order.index(0)
+    forward = order[start:] + order[:start]
+    if directed:
+        return forward
+    backward = forward[:1] + forward[:0:-1]
+    return min(forward, backward)
+
+
+def improving_two_opt(matrix, order):
+    # Whether reversing any stretch of the tour makes it shorter, trying every pair of edges
+    length = tour_length(matrix, order)
+    n = len(order)
+    for i in range(n - 1):
+        for j in range(i + 2, n):
+            if tour_length(matrix, order[:i + 1] + order[i + 1:j + 1][::-1] + order[j + 1:]) < length - ls.EPSILON:
+                return True
+    return False
+
+
+def euclidean(seed, n):
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2)) * 100
+    return np.hypot(*(points[:, None] - points[None]).transpose(2, 0, 1))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_symmetric_tours_are_two_opt_optimal(seed):
+    # With every other city as a candidate no 2-opt move left in the tour is an improvement
+    n = 5 + seed % 8
+    matrix = euclidean(seed, n)
+    search = ls.LocalSearch(lambda a, b: matrix[a][b], ls.matrix_candidates(matrix, n - 1))
+    start = random.Random(seed).sample(range(n), n)
+    order, length = search.optimize(list(start))
+
+    assert sorted(order) == list(range(n))
+    assert length == pytest.approx(tour_length(matrix, order))
+    assert length <= tour_length(matrix, start) + ls.EPSILON
+    assert not improving_two_opt(matrix, order)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_asymmetric_tours_only_use_or_opt(seed):
+    rng = np.random.default_rng(seed)
+    n = 5 + seed % 8
+    matrix = rng.integers(1, 100, (n, n)).astype(np.float64)
+    np.fill_diagonal(matrix, 0)
+    search = ls.LocalSearch(lambda a, b: matrix[a][b], ls.matrix_candidates(matrix, n - 1), symmetric=False)
+    start = random.Random(seed).sample(range(n), n)
+    order, length = search.optimize(list(start))
+
+    assert sorted(order) == list(range(n))
+    assert length == pytest.approx(tour_length(matrix, order))
+    assert length <= tour_length(matrix, start) + ls.EPSILON
+    assert search.two_opt_moves == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_moves_match_list_rewrites(seed):
+    # Reversals and segment moves on the typed tour arrays give the same tours as rewriting a plain list,
+    # and keep every city's position up to date
+    rng = random.Random(seed)
+    n = rng.randint(5, 15)
+    search = ls.LocalSearch(lambda a, b: 0, [[] for _ in range(n)])  # No candidates, so optimize() only sets the tour up
+    order = rng.sample(range(n), n)
+    search.optimize(list(order))
+
+    for _ in range(50):
+        i = rng.randrange(n)
+        if rng.random() < 0.5:
+            j = (i + rng.randrange(1, n)) % n
+            first, last = order[i], order[j]
+            rotated = order[i:] + order[:i]
+            span = (j - i) % n + 1
+            order = rotated[:span][::-1] + rotated[span:]
+            search._reverse(first, last)
+            assert cycle(search.tour.tolist(), directed=False) == cycle(order, directed=False)
+        else:
+            length = rng.randint(1, 3)
+            reverse = rng.random() < 0.5
+            rotated = order[i:] + order[:i]
+            segment, rest = rotated[:length], rotated[length:]
+            left = rng.choice(rest)
+            search._move_segment(rotated[0], length, left, reverse)
+            at = rest.index(left) + 1
+            order = rest[:at] + (segment[::-1] if reverse else segment) + rest[at:]
+            assert cycle(search.tour.tolist()) == cycle(order)
+        order = search.tour.tolist()
+        assert all(search.pos[city] == position for position, city in enumerate(order))
+
+
+def test_coordinates_give_a_valid_tour():
+    rng = np.random.default_rng(0)
+    coords = (rng.random((200, 2)) * 1000).tolist()
+    random.seed(0)
+    order, length = ls.LocalSearch.from_coordinates(coords).optimize()
+
+    points = np.array(coords)
+    assert sorted(order) == list(range(200))
+    assert length == pytest.approx(sum(np.hypot(*(points[order[i - 1]] - points[order[i]])) for i in range(200)))